@@ -0,0 +1,59 @@
+import argparse
+from typing import Final
+
+from src import animation
+from src.scenario import Scenario
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Animate the twin paradox, as the traveler ages."
+    )
+    parser.add_argument(
+        "--distance", type=float, default=10.0, help="distance to the planet [ly]"
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=0.5,
+        help="traveler speed, as a fraction of the speed of light",
+    )
+    parser.add_argument("--age-step", type=int, default=2, help="age step [y]")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--fps", type=float, default=60.0)
+    parser.add_argument("--dpi", type=float, help="resolution of the saved frames")
+    parser.add_argument(
+        "--output",
+        help="save to this .gif or .mp4 file, or to PNG files in this directory, "
+        "instead of playing in a window",
+    )
+    args: Final[argparse.Namespace] = parser.parse_args()
+    try:
+        args.scenario = Scenario(
+            x_planet=args.distance, traveler_speed=args.speed, age_step=args.age_step
+        )
+    except ValueError as error:
+        parser.error(str(error))
+    return args
+
+
+def _main() -> None:
+    args: Final[argparse.Namespace] = _parse_args()
+    scenario: Final[Scenario] = args.scenario
+    if args.output is not None:
+        animation.save(scenario, args.output, args.frames, args.fps, args.dpi)
+        return
+
+    import matplotlib.pyplot as plt  # type: ignore
+
+    from src import plotting
+
+    axes_earth, axes_traveler = plotting.draw_figure()
+    _animation: Final = animation.animate(
+        axes_earth, axes_traveler, scenario, args.frames, args.fps
+    )
+    plt.show()
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,161 @@
+import argparse
+from itertools import product
+from multiprocessing import Pool
+import json
+import os
+import time
+from typing import Any, Final, NamedTuple
+
+from src import instrumentation
+from src.scenario import Scenario
+
+
+class _Job(NamedTuple):
+    scenario: Scenario
+    image_format: str
+    path: str
+    cache_dir: str | None
+    cache_size: int
+    # perf_counter() value at which the trace starts, None when not tracing.
+    trace_origin: float | None
+
+
+# Figures and cache reused by the renders of a worker process, see _render_image().
+_figures: Any = None
+_cache: Any = None
+
+
+def _render(job: _Job) -> tuple[str, list[instrumentation.Phase]]:
+    if job.trace_origin is None:
+        _render_image(job)
+        return job.path, []
+
+    with instrumentation.record(origin=job.trace_origin) as recorder:
+        with instrumentation.phase(os.path.basename(job.path)):
+            _render_image(job)
+    return job.path, recorder.phases
+
+
+def _render_image(job: _Job) -> None:
+    global _figures, _cache
+    from src import diagram
+    from src.cache import Cache
+    from src.figurepool import FigurePool
+
+    if _figures is None:
+        _figures = FigurePool()
+    # All the jobs of a run share the same cache.
+    if _cache is None and job.cache_dir is not None:
+        _cache = Cache(job.cache_dir, job.cache_size, _figures)
+    image: Final[bytes] = (
+        _cache.image(job.scenario, job.image_format)
+        if _cache is not None
+        else diagram.render(job.scenario, job.image_format, figures=_figures)
+    )
+    with open(job.path, "wb") as file:
+        file.write(image)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Render a grid of twin paradox scenarios to image files."
+    )
+    parser.add_argument(
+        "--distances",
+        type=float,
+        nargs="+",
+        default=[10.0],
+        help="distances to the planet [ly]",
+    )
+    parser.add_argument(
+        "--speeds",
+        type=float,
+        nargs="+",
+        default=[0.5],
+        help="traveler speeds, as fractions of the speed of light",
+    )
+    parser.add_argument(
+        "--age-steps", type=int, nargs="+", default=[2], help="age steps [y]"
+    )
+    parser.add_argument("--format", choices=["png", "svg"], default="png")
+    parser.add_argument("--output-dir", default="out")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="number of worker processes (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="directory where to cache scenes and images across runs (default: none)",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=1024,
+        help="maximum size of the cache [MB]",
+    )
+    parser.add_argument(
+        "--trace",
+        help="write the time spent in each drawing phase to this file, "
+        "in the Trace Event Format (chrome://tracing, Perfetto, speedscope)",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=1,
+        help="number of scenarios handed to a worker at once",
+    )
+    args: Final[argparse.Namespace] = parser.parse_args()
+    try:
+        args.scenarios = [
+            Scenario(
+                x_planet=x_planet, traveler_speed=traveler_speed, age_step=age_step
+            )
+            for x_planet, traveler_speed, age_step in product(
+                args.distances, args.speeds, args.age_steps
+            )
+        ]
+    except ValueError as error:
+        parser.error(str(error))
+    return args
+
+
+def _main() -> None:
+    args: Final[argparse.Namespace] = _parse_args()
+    os.makedirs(args.output_dir, exist_ok=True)
+    trace_origin: Final[float | None] = (
+        time.perf_counter() if args.trace is not None else None
+    )
+
+    jobs: Final[list[_Job]] = [
+        _Job(
+            scenario,
+            args.format,
+            os.path.join(
+                args.output_dir,
+                f"twins_d{scenario.x_planet:g}_v{scenario.traveler_speed:g}"
+                f"_s{scenario.age_step}.{args.format}",
+            ),
+            args.cache_dir,
+            args.cache_size * 1024 * 1024,
+            trace_origin,
+        )
+        for scenario in args.scenarios
+    ]
+
+    phases: Final[list[instrumentation.Phase]] = []
+    with Pool(args.workers) as pool:
+        for path, job_phases in pool.imap_unordered(
+            _render, jobs, chunksize=args.chunksize
+        ):
+            print(path)
+            phases.extend(job_phases)
+
+    if args.trace is not None:
+        with open(args.trace, "w") as file:
+            json.dump({"traceEvents": instrumentation.trace_events(phases)}, file)
+
+
+if __name__ == "__main__":
+    _main()
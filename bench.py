@@ -0,0 +1,293 @@
+import argparse
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Final
+
+import matplotlib  # type: ignore
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # type: ignore
+import numpy as np
+
+from src import diagram
+from src.figurepool import FigurePool
+from src import maths
+from src import plotting
+from src import renderer
+from src.scenario import Scenario
+
+# A benchmark sets up its inputs and returns the function to time, along with the
+# figure(s) that function draws on, if any.
+_Benchmark = Callable[[], tuple[Callable[[], Any], Any]]
+
+
+def _maths_scalar(count: int) -> _Benchmark:
+    def setup() -> tuple[Callable[[], Any], Any]:
+        x = np.linspace(0.0, 100.0, count).tolist()
+        t = np.linspace(0.0, 200.0, count).tolist()
+
+        def run() -> None:
+            for x2, t2 in zip(x, t):
+                maths.lorentz_transform_prime_to_reference(x2, t2, 0.5)
+                maths.lorentz_transform_reference_to_prime(x2, t2, 0.5)
+
+        return run, None
+
+    return setup
+
+
+def _maths_array(count: int) -> _Benchmark:
+    def setup() -> tuple[Callable[[], Any], Any]:
+        x = np.linspace(0.0, 100.0, count)
+        t = np.linspace(0.0, 200.0, count)
+
+        def run() -> None:
+            maths.lorentz_transform_prime_to_reference_array(x, t, 0.5)
+            maths.lorentz_transform_reference_to_prime_array(x, t, 0.5)
+
+        return run, None
+
+    return setup
+
+
+def _simultaneity(count: int, reverse: bool) -> _Benchmark:
+    def setup() -> tuple[Callable[[], Any], Any]:
+        itinerary = Scenario().itinerary
+        ages = np.linspace(0.0, itinerary.end_age, count)
+        earth_times = itinerary.earth_times(ages)
+
+        def run() -> None:
+            if reverse:
+                itinerary.simultaneous_ages(earth_times)
+            else:
+                itinerary.earth_times(ages)
+
+        return run, None
+
+    return setup
+
+
+def _draw_figure() -> tuple[Callable[[], Any], Any]:
+    figures: Final[list[Any]] = []
+
+    def run() -> None:
+        axes, _ = plotting.draw_figure()
+        figures.append(axes.figure)
+
+    return run, figures
+
+
+def _build_earth_frame(scenario: Scenario) -> _Benchmark:
+    # Building the panel, then drawing it on the axes of an existing figure.
+    def setup() -> tuple[Callable[[], Any], Any]:
+        axes, _ = plotting.draw_figure()
+
+        def run() -> None:
+            renderer.draw_panel(axes, diagram.build_earth_frame(scenario))
+
+        return run, axes.figure
+
+    return setup
+
+
+def _build_traveler_frame(scenario: Scenario) -> _Benchmark:
+    # Building the panel, then drawing it on the axes of an existing figure.
+    def setup() -> tuple[Callable[[], Any], Any]:
+        _, axes = plotting.draw_figure()
+
+        def run() -> None:
+            renderer.draw_panel(axes, diagram.build_traveler_frame(scenario))
+
+        return run, axes.figure
+
+    return setup
+
+
+def _render_png(scenario: Scenario) -> _Benchmark:
+    def setup() -> tuple[Callable[[], Any], Any]:
+        axes_earth, axes_traveler = plotting.draw_figure()
+
+        def run() -> None:
+            diagram.draw(axes_earth, axes_traveler, scenario)
+            axes_earth.figure.savefig(io.BytesIO(), format="png")
+
+        return run, axes_earth.figure
+
+    return setup
+
+
+def _render_pooled_png(scenario: Scenario) -> _Benchmark:
+    def setup() -> tuple[Callable[[], Any], Any]:
+        pool: Final[FigurePool] = FigurePool()
+        # The figure, its frame and its layout are already there, as in a batch.
+        pool.render(diagram.build(scenario))
+
+        def run() -> None:
+            pool.render(diagram.build(scenario))
+
+        # The same figure gets reused by run(), so its artists are the rendered ones.
+        return run, pool.figures
+
+    return setup
+
+
+def _benchmarks(
+    distances: list[float], age_steps: list[int], event_count: int
+) -> dict[str, _Benchmark]:
+    benchmarks: Final[dict[str, _Benchmark]] = {
+        f"maths.scalar[n={event_count}]": _maths_scalar(event_count),
+        f"maths.array[n={event_count}]": _maths_array(event_count),
+        f"worldline.earth_times[n={event_count}]": _simultaneity(event_count, False),
+        f"worldline.simultaneous_ages[n={event_count}]": _simultaneity(
+            event_count, True
+        ),
+        "plotting.draw_figure": lambda: _draw_figure(),
+    }
+    for x_planet in distances:
+        for age_step in age_steps:
+            scenario = Scenario(x_planet=x_planet, age_step=age_step)
+            suffix = f"[d={x_planet:g},step={age_step}]"
+            benchmarks[f"diagram.build_earth_frame{suffix}"] = _build_earth_frame(
+                scenario
+            )
+            benchmarks[f"diagram.build_traveler_frame{suffix}"] = _build_traveler_frame(
+                scenario
+            )
+            benchmarks[f"render.png{suffix}"] = _render_png(scenario)
+            benchmarks[f"render.pooled.png{suffix}"] = _render_pooled_png(scenario)
+    return benchmarks
+
+
+def _count_artists(figures: Any) -> int:
+    if figures is None:
+        return 0
+    if not isinstance(figures, list):
+        figures = [figures]
+    return sum(
+        len(axes.get_children()) for figure in figures for axes in figure.get_axes()
+    )
+
+
+def _close(figures: Any) -> None:
+    if figures is None:
+        return
+    for figure in figures if isinstance(figures, list) else [figures]:
+        plt.close(figure)
+
+
+def _measure(benchmark: _Benchmark, repeat: int) -> dict[str, float]:
+    seconds: list[float] = []
+    artists: int = 0
+    for _ in range(repeat):
+        run, figures = benchmark()
+        start = time.perf_counter()
+        run()
+        seconds.append(time.perf_counter() - start)
+        artists = _count_artists(figures)
+        _close(figures)
+
+    # Separate run, as tracing allocations slows everything down.
+    run, figures = benchmark()
+    tracemalloc.start()
+    run()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    _close(figures)
+
+    return {
+        "seconds": min(seconds),
+        "median_seconds": float(np.median(seconds)),
+        "artists": artists,
+        "peak_bytes": peak_bytes,
+    }
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Time the math and drawing hot paths, and compare with a baseline."
+    )
+    parser.add_argument("--distances", type=float, nargs="+", default=[10.0, 50.0])
+    parser.add_argument("--age-steps", type=int, nargs="+", default=[1, 2])
+    parser.add_argument(
+        "--events",
+        type=int,
+        default=100_000,
+        help="number of events for the Lorentz transform benchmarks",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="runs per benchmark, the best is kept"
+    )
+    parser.add_argument("--filter", default="", help="only run benchmarks containing")
+    parser.add_argument("--save", help="save the results to this JSON file")
+    parser.add_argument("--compare", help="compare with results saved with --save")
+    parser.add_argument(
+        "--max-slowdown",
+        type=float,
+        default=1.2,
+        help="with --compare, fail if a benchmark is slower than baseline by this factor",
+    )
+    args: Final[argparse.Namespace] = parser.parse_args()
+    try:
+        for x_planet in args.distances:
+            for age_step in args.age_steps:
+                Scenario(x_planet=x_planet, age_step=age_step)
+    except ValueError as error:
+        parser.error(str(error))
+    return args
+
+
+def _main() -> None:
+    args: Final[argparse.Namespace] = _parse_args()
+    baseline: Final[dict[str, Any]] = {}
+    if args.compare is not None:
+        with open(args.compare) as file:
+            baseline.update(json.load(file)["results"])
+
+    results: Final[dict[str, dict[str, float]]] = {}
+    regressions: Final[list[str]] = []
+    print(f"{'benchmark':45} {'time [ms]':>10} {'artists':>8} {'peak [KiB]':>11}")
+    for name, benchmark in _benchmarks(
+        args.distances, args.age_steps, args.events
+    ).items():
+        if args.filter not in name:
+            continue
+        result = _measure(benchmark, args.repeat)
+        results[name] = result
+        line = (
+            f"{name:45} {result['seconds'] * 1000:10.2f} {result['artists']:8} "
+            f"{result['peak_bytes'] / 1024:11.0f}"
+        )
+        if name in baseline:
+            ratio = result["seconds"] / baseline[name]["seconds"]
+            line += f"  x{ratio:.2f} vs baseline"
+            if ratio > args.max_slowdown:
+                regressions.append(name)
+                line += " SLOWER"
+        print(line)
+
+    if args.save is not None:
+        with open(args.save, "w") as file:
+            json.dump(
+                {
+                    "python": sys.version,
+                    "platform": platform.platform(),
+                    "matplotlib": matplotlib.__version__,
+                    "numpy": np.__version__,
+                    "results": results,
+                },
+                file,
+                indent=2,
+            )
+
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) slower than baseline", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,54 @@
+import argparse
+import json
+from typing import Final
+
+# Only the numbers: neither matplotlib nor NumPy gets imported.
+from src.scenario import Scenario
+
+_QUANTITIES: Final[tuple[str, ...]] = (
+    "gamma",
+    "rapidity",
+    "t_planet",
+    "t_reunion",
+    "traveler_age_on_planet",
+    "traveler_end_age",
+    "t_end_first_leg_on_earth",
+    "t_begin_second_leg_on_earth",
+    "d_earth_from_planet",
+    "earth_speed_from_traveler",
+)
+
+
+def compute(scenario: Scenario) -> dict[str, float]:
+    return {name: getattr(scenario, name) for name in _QUANTITIES}
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Print the quantities of a twin paradox trip as JSON, "
+        "without drawing anything."
+    )
+    parser.add_argument(
+        "--distance", type=float, default=10.0, help="distance to the planet [ly]"
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=0.5,
+        help="traveler speed, as a fraction of the speed of light",
+    )
+    args: Final[argparse.Namespace] = parser.parse_args()
+    try:
+        args.scenario = Scenario(x_planet=args.distance, traveler_speed=args.speed)
+    except ValueError as error:
+        parser.error(str(error))
+    return args
+
+
+def _main() -> None:
+    args: Final[argparse.Namespace] = _parse_args()
+    print(json.dumps(compute(args.scenario), indent=2))
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,43 @@
+import argparse
+from typing import Any, Final
+
+import numpy as np
+
+from src import ensemble
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compute the trips of many travelers, without drawing them."
+    )
+    parser.add_argument(
+        "input",
+        help=".npy file of travelers: an (n, 2) array of distances [ly] and speeds, "
+        "or a structured array with distance and speed fields",
+    )
+    parser.add_argument(
+        "output",
+        help=f".npy or .csv file where to write {', '.join(ensemble.FIELDS)}",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=ensemble.DEFAULT_CHUNK_SIZE,
+        help="number of travelers computed at once",
+    )
+    return parser.parse_args()
+
+
+def _main() -> None:
+    args: Final[argparse.Namespace] = _parse_args()
+    # Memory-mapped, so that inputs larger than memory get read chunk by chunk.
+    travelers: Final[Any] = np.load(args.input, mmap_mode="r")
+    if travelers.dtype.names is not None:
+        distances, speeds = travelers["distance"], travelers["speed"]
+    else:
+        distances, speeds = travelers[:, 0], travelers[:, 1]
+    ensemble.save(args.output, distances, speeds, args.chunk_size)
+
+
+if __name__ == "__main__":
+    _main()
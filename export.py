@@ -0,0 +1,76 @@
+import argparse
+from itertools import product
+from typing import Callable, Final
+
+from src import diagram
+from src import export
+from src import scene
+from src.scenario import Scenario
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Write the events of a grid of twin paradox scenarios to a "
+        "memory-mappable .npy file, without rendering them."
+    )
+    parser.add_argument(
+        "output",
+        help=".npy file where to write "
+        f"{', '.join(export.DTYPE.names or ())}; the label table goes to a .json "
+        "file next to it",
+    )
+    parser.add_argument(
+        "--distances",
+        type=float,
+        nargs="+",
+        default=[10.0],
+        help="distances to the planet [ly]",
+    )
+    parser.add_argument(
+        "--speeds",
+        type=float,
+        nargs="+",
+        default=[0.5],
+        help="traveler speeds, as fractions of the speed of light",
+    )
+    parser.add_argument(
+        "--age-steps", type=int, nargs="+", default=[2], help="age steps [y]"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="directory where to cache scenes across runs (default: none)",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=1024,
+        help="maximum size of the cache [MB]",
+    )
+    args: Final[argparse.Namespace] = parser.parse_args()
+    try:
+        args.scenarios = [
+            Scenario(
+                x_planet=x_planet, traveler_speed=traveler_speed, age_step=age_step
+            )
+            for x_planet, traveler_speed, age_step in product(
+                args.distances, args.speeds, args.age_steps
+            )
+        ]
+    except ValueError as error:
+        parser.error(str(error))
+    return args
+
+
+def _main() -> None:
+    args: Final[argparse.Namespace] = _parse_args()
+    build: Callable[[Scenario], scene.Scene] = diagram.build
+    if args.cache_dir is not None:
+        from src.cache import Cache
+
+        build = Cache(args.cache_dir, args.cache_size * 1024 * 1024).scene
+
+    export.save(args.output, args.scenarios, build)
+
+
+if __name__ == "__main__":
+    _main()
@@ -1,67 +1,82 @@
-from math import ceil
+import argparse
+import math
 from typing import Final
 
 import matplotlib.pyplot as plt  # type: ignore
 
-from src import earthframe
-from src import travelerframe
+from src import diagram
 from src import plotting
+from src import renderer
+from src import signals
+from src.scenario import Scenario
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Plot the twin paradox.")
+    parser.add_argument(
+        "--interactive",
+        action="store_true",
+        help="add sliders for the distance, the speed and the age step",
+    )
+    parser.add_argument(
+        "--acceleration",
+        type=float,
+        help="instead of the traveler's frames, show the trip with this constant "
+        "proper acceleration [ly/y², 1 g is about 1.03]",
+    )
+    parser.add_argument(
+        "--observer",
+        type=float,
+        help="instead of the traveler's frames, show the Earth frame as seen by an "
+        "observer moving at this velocity (fraction of the speed of light)",
+    )
+    parser.add_argument(
+        "--signals",
+        type=float,
+        help="add light signals sent by each twin to the other, every this many "
+        "years of their own time",
+    )
+    args: Final[argparse.Namespace] = parser.parse_args()
+    if args.acceleration is not None and not 0 < args.acceleration < math.inf:
+        parser.error("--acceleration must be positive and finite")
+    if args.observer is not None and not -1 < args.observer < 1:
+        parser.error("--observer must be slower than light, between -1 and 1")
+    return args
 
 
 def _main() -> None:
-    x_planet: Final[float] = 10.0
-    traveler_speed: Final[float] = 0.5
-    t_planet: Final[float] = x_planet / traveler_speed
-    t_reunion: Final[float] = 2 * t_planet
-    t_max: Final[float] = t_reunion + 4.0
+    args: Final[argparse.Namespace] = _parse_args()
+    scenario = Scenario(x_planet=10.0, traveler_speed=0.5, age_step=2)
 
-    margin: Final[float] = 1.5
+    if args.interactive:
+        from src.interactive import Explorer
 
-    axes_earth, axes_traveler = plotting.draw_figure()
+        _explorer: Final = Explorer(scenario)
+        plt.show()
+        return
 
-    color_earth: Final[str] = "#0088ff"
-    color_traveler_first_leg: Final[str] = "orange"
-    color_traveler_second_leg: Final[str] = "#aa00aa"
-    leg_width: Final[int] = 2
-    leg_style: Final[str] = "-"
-    age_step: Final[int] = 2
+    earth_frame = diagram.build_earth_frame(scenario)
+    if args.signals is not None:
+        earth_frame = signals.overlay(
+            signals.overlay(
+                earth_frame,
+                signals.from_earth(scenario.itinerary, args.signals),
+                scenario.color_earth,
+            ),
+            signals.from_traveler(scenario.itinerary, args.signals),
+            scenario.color_traveler_first_leg,
+        )
 
-    traveler_end_age, d_earth_from_planet = earthframe.draw(
-        axes_earth,
-        -2.0,
-        x_planet * 2.0,
-        t_max,
-        t_reunion,
-        x_planet,
-        t_planet,
-        traveler_speed,
-        age_step,
-        margin,
-        color_traveler_first_leg,
-        color_traveler_second_leg,
-        color_earth,
-        leg_width,
-        leg_style,
-    )
+    if args.acceleration is not None:
+        other_frame = diagram.build_accelerated_frame(scenario, args.acceleration)
+    elif args.observer is not None:
+        other_frame = diagram.build_observer_frame(scenario, args.observer)
+    else:
+        other_frame = diagram.build_traveler_frame(scenario)
 
-    travelerframe.draw(
-        axes_traveler,
-        x_planet * -1.0,
-        2.0,
-        ceil(traveler_end_age / 2.0 + 1.0) * 2,
-        traveler_end_age,
-        t_reunion,
-        x_planet,
-        traveler_speed,
-        d_earth_from_planet,
-        age_step,
-        margin,
-        color_traveler_first_leg,
-        color_traveler_second_leg,
-        color_earth,
-        leg_width,
-        leg_style,
-    )
+    axes_earth, axes_traveler = plotting.draw_figure()
+    renderer.draw_panel(axes_earth, earth_frame)
+    renderer.draw_panel(axes_traveler, other_frame)
 
     plt.show()
 
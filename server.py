@@ -0,0 +1,204 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import dataclasses
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import threading
+from typing import Any, Final
+
+from src.scenario import Scenario
+
+_CONTENT_TYPES: Final[dict[str, str]] = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+}
+
+# Set in each worker process by _init_worker().
+_cache: Any = None
+_figures: Any = None
+
+
+def _init_worker(cache_dir: str | None, cache_size: int) -> None:
+    global _cache, _figures
+    from src import diagram
+    from src.figurepool import FigurePool
+
+    _figures = FigurePool()
+    if cache_dir is not None:
+        from src.cache import Cache
+
+        _cache = Cache(cache_dir, cache_size, _figures)
+
+    # Warm up: loads matplotlib, the fonts and the Agg backend.
+    diagram.render(Scenario(x_planet=1.0), "png", figures=_figures)
+
+
+def _render(scenario: Scenario, image_format: str) -> bytes:
+    from src import diagram
+
+    if _cache is not None:
+        return _cache.image(scenario, image_format)
+    return diagram.render(scenario, image_format, figures=_figures)
+
+
+class _Server(ThreadingHTTPServer):
+    def __init__(
+        self,
+        address: tuple[str, int],
+        pool: ProcessPoolExecutor,
+        max_pending: int,
+    ) -> None:
+        super().__init__(address, _Handler)
+        self.pool: Final[ProcessPoolExecutor] = pool
+        # Requests being rendered or waiting for a worker. Beyond that, requests get
+        # rejected right away instead of piling up.
+        self.pending: Final[threading.BoundedSemaphore] = threading.BoundedSemaphore(
+            max_pending
+        )
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: _Server
+
+    def do_GET(self) -> None:
+        if self.path != "/health":
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        self._send(HTTPStatus.OK, "text/plain", b"ok\n")
+
+    def do_POST(self) -> None:
+        """
+        Renders the scenario given as a JSON object with Scenario fields (x_planet,
+        traveler_speed, age_step...) and an optional "format": "png" (default) or "svg".
+        """
+        if self.path != "/render":
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        try:
+            parameters = json.loads(
+                self.rfile.read(int(self.headers["Content-Length"]))
+            )
+            image_format = parameters.pop("format", "png")
+            if image_format not in _CONTENT_TYPES:
+                raise ValueError(f"unknown format: {image_format}")
+            scenario = _scenario(parameters)
+        except (AttributeError, TypeError, ValueError) as e:
+            self.send_error(HTTPStatus.BAD_REQUEST, str(e))
+            return
+
+        if not self.server.pending.acquire(blocking=False):
+            self.send_response(HTTPStatus.SERVICE_UNAVAILABLE)
+            self.send_header("Retry-After", "1")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        try:
+            image = self.server.pool.submit(_render, scenario, image_format).result()
+        except Exception as e:
+            self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, str(e))
+            return
+        finally:
+            self.server.pending.release()
+
+        self._send(HTTPStatus.OK, _CONTENT_TYPES[image_format], image)
+
+    def _send(self, status: HTTPStatus, content_type: str, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _scenario(parameters: dict[str, Any]) -> Scenario:
+    """
+    Scenario with the parameters, checked here so that invalid ones get a 400 response
+    instead of failing in a worker. Scenario checks the numbers, and the colors are
+    checked here.
+    """
+    known: Final[set[str]] = {field.name for field in dataclasses.fields(Scenario)}
+    unknown: Final[set[str]] = set(parameters) - known
+    if unknown:
+        raise ValueError(f"unknown parameters: {', '.join(sorted(unknown))}")
+    scenario: Final[Scenario] = Scenario(**parameters)
+
+    colors: Final[list[str]] = [
+        name
+        for name in (
+            "color_earth",
+            "color_traveler_first_leg",
+            "color_traveler_second_leg",
+        )
+        if name in parameters
+    ]
+    if colors:
+        from matplotlib.colors import is_color_like  # type: ignore
+
+        for name in colors:
+            # Strings only: JSON arrays would be lists, which colors can't be as they
+            # get hashed, e.g. by plotting.darken().
+            if not isinstance(parameters[name], str) or not is_color_like(
+                parameters[name]
+            ):
+                raise ValueError(f"{name} must be a color name or a hex string")
+    return scenario
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Serve twin paradox diagrams over HTTP: "
+        "POST /render with a JSON scenario returns a PNG or SVG image."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="number of rendering processes (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--max-pending",
+        type=int,
+        default=None,
+        help="requests accepted at once, others get 503 (default: 4 per worker)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="directory where to cache scenes and images (default: none)",
+    )
+    parser.add_argument(
+        "--cache-size", type=int, default=1024, help="maximum size of the cache [MB]"
+    )
+    return parser.parse_args()
+
+
+def _main() -> None:
+    args: Final[argparse.Namespace] = _parse_args()
+    workers: Final[int] = args.workers or 1
+    with ProcessPoolExecutor(
+        workers,
+        initializer=_init_worker,
+        initargs=(args.cache_dir, args.cache_size * 1024 * 1024),
+    ) as pool:
+        # Start and warm up all the workers before accepting requests.
+        for future in [pool.submit(int) for _ in range(workers)]:
+            future.result()
+
+        with _Server(
+            (args.host, args.port),
+            pool,
+            args.max_pending if args.max_pending is not None else 4 * workers,
+        ) as server:
+            print(f"Serving on http://{args.host}:{args.port}", flush=True)
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,320 @@
+from dataclasses import dataclass
+import os
+from pathlib import Path
+import subprocess
+from typing import TYPE_CHECKING, Any, Final, Iterator
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src import diagram
+from src import plotting
+from src.scenario import Scenario
+from src.worldline import Itinerary
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes  # type: ignore
+
+
+@dataclass(frozen=True)
+class Track:
+    """
+    Moving events of an animation, one row per frame, at the traveler's ages. Earth's
+    ages are the ones simultaneous with the traveler's, in the traveler's frame.
+    """
+
+    ages: NDArray[np.float64]
+    earth_ages: NDArray[np.float64]
+    # (n, 2) arrays of (x, t) events in the Earth frame panel.
+    traveler_in_earth_frame: NDArray[np.float64]
+    earth_in_earth_frame: NDArray[np.float64]
+    # Where the light sent by the traveler to Earth arrives.
+    light_in_earth_frame: NDArray[np.float64]
+    # (n, 2) arrays of (x', t') events in the traveler's frames panel.
+    traveler_in_traveler_frame: NDArray[np.float64]
+    earth_in_traveler_frame: NDArray[np.float64]
+
+
+def track(scenario: Scenario, frame_count: int) -> Track:
+    itinerary: Final[Itinerary] = scenario.itinerary
+    ages: Final[NDArray[np.float64]] = np.linspace(
+        0.0, scenario.traveler_end_age, frame_count
+    )
+    # Unlike with itinerary.legs(), the turnaround belongs to the outbound leg.
+    legs: Final[NDArray[np.intp]] = np.clip(
+        np.searchsorted(itinerary.start_ages, ages, side="left") - 1,
+        0,
+        len(itinerary.durations) - 1,
+    )
+    x, t = itinerary.events(ages, legs)
+    earth_ages: Final[NDArray[np.float64]] = itinerary.earth_times(ages, legs)
+
+    # In the traveler's frames, Earth moves at the opposite velocity, from x'=0 on the
+    # way out and from where it is at the turnaround on the way back.
+    starts: Final[NDArray[np.float64]] = np.array([0.0, -scenario.d_earth_from_planet])
+    ages_in_leg: Final[NDArray[np.float64]] = ages - itinerary.start_ages[legs]
+    earth_x_in_traveler_frame: Final[NDArray[np.float64]] = (
+        starts[legs] - itinerary.velocities[legs] * ages_in_leg
+    )
+
+    zeros: Final[NDArray[np.float64]] = np.zeros_like(ages)
+    return Track(
+        ages,
+        earth_ages,
+        np.column_stack((x, t)),
+        np.column_stack((zeros, earth_ages)),
+        np.column_stack((zeros, t + x)),
+        np.column_stack((zeros, ages)),
+        np.column_stack((earth_x_in_traveler_frame, ages)),
+    )
+
+
+class Playback:
+    """
+    Draws the diagram of the scenario once, then moves the traveler along with their
+    simultaneity lines, light ray and age markers, frame by frame. Only these artists
+    are animated, so the rest can be blitted.
+    """
+
+    def __init__(
+        self,
+        axes_earth: "Axes",
+        axes_traveler: "Axes",
+        scenario: Scenario,
+        frame_count: int,
+    ) -> None:
+        self.scenario: Final[Scenario] = scenario
+        self.track: Final[Track] = track(scenario, frame_count)
+        diagram.draw(axes_earth, axes_traveler, scenario)
+
+        color_traveler: Final[Any] = plotting.darken(scenario.color_traveler_first_leg)
+        color_earth: Final[Any] = plotting.darken(scenario.color_earth)
+        color_light: Final[Any] = plotting.darken("green")
+
+        def line(axes: "Axes", color: Any) -> Any:
+            (artist,) = axes.plot(
+                [], [], color=color, linewidth=1.5, linestyle="--", animated=True
+            )
+            return artist
+
+        def markers(axes: "Axes") -> Any:
+            return axes.scatter(
+                [0, 0],
+                [0, 0],
+                s=64,
+                color=[color_traveler, color_earth],
+                zorder=40,
+                animated=True,
+            )
+
+        def text(axes: "Axes") -> Any:
+            return axes.text(
+                0.02,
+                0.98,
+                "",
+                transform=axes.transAxes,
+                verticalalignment="top",
+                fontsize=14,
+                animated=True,
+            )
+
+        self._simultaneity_earth_frame: Final[Any] = line(axes_earth, color_traveler)
+        self._light_earth_frame: Final[Any] = line(axes_earth, color_light)
+        self._markers_earth_frame: Final[Any] = markers(axes_earth)
+        self._ages_earth_frame: Final[Any] = text(axes_earth)
+        self._simultaneity_traveler_frame: Final[Any] = line(
+            axes_traveler, color_traveler
+        )
+        self._markers_traveler_frame: Final[Any] = markers(axes_traveler)
+        self._ages_traveler_frame: Final[Any] = text(axes_traveler)
+
+    @property
+    def artists(self) -> list[Any]:
+        return [
+            self._simultaneity_earth_frame,
+            self._light_earth_frame,
+            self._markers_earth_frame,
+            self._ages_earth_frame,
+            self._simultaneity_traveler_frame,
+            self._markers_traveler_frame,
+            self._ages_traveler_frame,
+        ]
+
+    def update(self, frame: int) -> list[Any]:
+        track: Final[Track] = self.track
+        traveler: Final[NDArray[np.float64]] = track.traveler_in_earth_frame[frame]
+        earth: Final[NDArray[np.float64]] = track.earth_in_earth_frame[frame]
+        self._simultaneity_earth_frame.set_data(
+            [traveler[0], earth[0]], [traveler[1], earth[1]]
+        )
+        light: Final[NDArray[np.float64]] = track.light_in_earth_frame[frame]
+        self._light_earth_frame.set_data(
+            [traveler[0], light[0]], [traveler[1], light[1]]
+        )
+        self._markers_earth_frame.set_offsets([traveler, earth])
+
+        traveler_prime: Final[NDArray[np.float64]] = track.traveler_in_traveler_frame[
+            frame
+        ]
+        earth_prime: Final[NDArray[np.float64]] = track.earth_in_traveler_frame[frame]
+        self._simultaneity_traveler_frame.set_data(
+            [traveler_prime[0], earth_prime[0]], [traveler_prime[1], earth_prime[1]]
+        )
+        self._markers_traveler_frame.set_offsets([traveler_prime, earth_prime])
+
+        ages: Final[str] = (
+            f"traveler: {track.ages[frame]:.1f} y\nEarth: {track.earth_ages[frame]:.1f} y"
+        )
+        self._ages_earth_frame.set_text(ages)
+        self._ages_traveler_frame.set_text(ages)
+        return self.artists
+
+
+def frames(playback: Playback, dpi: float | None = None) -> Iterator[NDArray[np.uint8]]:
+    """
+    Renders the frames as (height, width, 4) RGBA arrays, off-screen. The static diagram
+    is drawn once, then each frame only draws the animated artists over a copy of it.
+    The yielded array is only valid until the next frame gets rendered.
+    """
+    figure: Final[Any] = playback.artists[0].figure
+    if dpi is not None:
+        figure.set_dpi(dpi)
+    canvas: Final[Any] = figure.canvas
+    canvas.draw()
+    # The background must not move under the animated artists.
+    figure.set_layout_engine("none")
+    background: Final[Any] = canvas.copy_from_bbox(figure.bbox)
+    for frame in range(len(playback.track.ages)):
+        canvas.restore_region(background)
+        for artist in playback.update(frame):
+            figure.draw_artist(artist)
+        yield np.asarray(canvas.buffer_rgba())
+
+
+def save(
+    scenario: Scenario,
+    path: str | os.PathLike,
+    frame_count: int,
+    fps: float,
+    dpi: float | None = None,
+) -> None:
+    """
+    Saves the animation of the scenario as a GIF (with Pillow), an MP4 (with ffmpeg), or
+    as numbered PNG files if path is a directory.
+    """
+    figure, axes_earth, axes_traveler = plotting.new_figure()
+    playback: Final[Playback] = Playback(
+        axes_earth, axes_traveler, scenario, frame_count
+    )
+    path = Path(path)
+    if path.suffix == ".gif":
+        _save_gif(playback, path, fps, dpi)
+    elif path.suffix == ".mp4":
+        _save_mp4(playback, path, fps, dpi)
+    else:
+        _save_pngs(playback, path, dpi)
+
+
+def _save_gif(playback: Playback, path: Path, fps: float, dpi: float | None) -> None:
+    from PIL import Image  # type: ignore
+
+    # Quantized as they get rendered: Pillow keeps all the frames until it's done, and
+    # this way at a byte per pixel. It only writes the rectangle that changed in each.
+    images: Final[Iterator[Any]] = (
+        Image.fromarray(frame[:, :, :3]).quantize() for frame in frames(playback, dpi)
+    )
+    next(images).save(
+        path,
+        save_all=True,
+        append_images=images,
+        loop=0,
+        duration=round(1000 / fps),
+    )
+
+
+def _save_mp4(playback: Playback, path: Path, fps: float, dpi: float | None) -> None:
+    import matplotlib  # type: ignore
+
+    process: subprocess.Popen | None = None
+    try:
+        for frame in frames(playback, dpi):
+            if process is None:
+                height, width, _ = frame.shape
+                process = subprocess.Popen(
+                    [
+                        matplotlib.rcParams["animation.ffmpeg_path"],
+                        "-y",
+                        "-loglevel",
+                        "error",
+                        "-f",
+                        "rawvideo",
+                        "-pix_fmt",
+                        "rgba",
+                        "-s",
+                        f"{width}x{height}",
+                        "-r",
+                        str(fps),
+                        "-i",
+                        "-",
+                        # libx264 with yuv420p needs even sizes.
+                        "-vf",
+                        "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+                        "-vcodec",
+                        "libx264",
+                        "-pix_fmt",
+                        "yuv420p",
+                        str(path),
+                    ],
+                    stdin=subprocess.PIPE,
+                )
+            assert process.stdin is not None
+            process.stdin.write(frame.tobytes())
+    finally:
+        if process is not None:
+            assert process.stdin is not None
+            process.stdin.close()
+            if process.wait() != 0:
+                raise RuntimeError(f"ffmpeg failed with code {process.returncode}")
+
+
+def _save_pngs(playback: Playback, directory: Path, dpi: float | None) -> None:
+    from PIL import Image  # type: ignore
+
+    directory.mkdir(parents=True, exist_ok=True)
+    for i, frame in enumerate(frames(playback, dpi)):
+        # Low compression: PNG encoding would take most of the time otherwise.
+        Image.fromarray(frame).save(directory / f"frame_{i:05}.png", compress_level=1)
+
+
+def animate(
+    axes_earth: "Axes",
+    axes_traveler: "Axes",
+    scenario: Scenario,
+    frame_count: int,
+    fps: float,
+) -> Any:
+    """
+    Plays the animation in the window of the figure, with blitting. The returned
+    animation must be kept referenced while playing.
+    """
+    from matplotlib.animation import FuncAnimation  # type: ignore
+
+    playback: Final[Playback] = Playback(
+        axes_earth, axes_traveler, scenario, frame_count
+    )
+    figure: Final[Any] = axes_earth.figure
+
+    def freeze_layout(_event: Any) -> None:
+        # Constrained layout would otherwise move the blitted background around.
+        figure.set_layout_engine("none")
+        figure.canvas.mpl_disconnect(connection)
+
+    connection: Final[int] = figure.canvas.mpl_connect("draw_event", freeze_layout)
+    return FuncAnimation(
+        figure,
+        playback.update,
+        frames=frame_count,
+        init_func=lambda: playback.artists,
+        interval=1000 / fps,
+        blit=True,
+    )
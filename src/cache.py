@@ -0,0 +1,178 @@
+import dataclasses
+import hashlib
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+import shutil
+import tempfile
+from typing import Any, BinaryIO, Callable, Final
+
+import numpy as np
+
+from src import diagram
+from src import scene
+from src.figurepool import FigurePool
+from src.scenario import Scenario
+
+_SCENE_METADATA: Final[str] = "scene.json"
+_SCENE_DATA: Final[str] = "scene.npy"
+
+
+class Cache:
+    """
+    On-disk cache of scenes and rendered images, keyed by a hash of the scenario and of
+    the source code. Each scenario gets a directory; the least recently used ones are
+    evicted once the cache holds more than max_bytes. The size of the cache is only
+    measured again once the bytes written by this instance take it over max_bytes, so
+    that writes don't cost a scan of the whole cache.
+
+    Scene coordinates are stored in a single .npy file, memory-mapped when loaded.
+    Missing images are rendered with figures, if given.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        max_bytes: int,
+        figures: FigurePool | None = None,
+    ) -> None:
+        self._directory: Final[Path] = Path(directory)
+        self._max_bytes: Final[int] = max_bytes
+        self._figures: Final[FigurePool | None] = figures
+        self._directory.mkdir(parents=True, exist_ok=True)
+        # Size of the cache at the last scan, plus what got written since. None until
+        # the first write.
+        self._size: int | None = None
+
+    def scene(self, scenario: Scenario) -> scene.Scene:
+        entry: Final[Path] = self._entry(scenario)
+        try:
+            cached = scene.from_arrays(
+                json.loads((entry / _SCENE_METADATA).read_text()),
+                np.load(entry / _SCENE_DATA, mmap_mode="r"),
+            )
+            _touch(entry)
+            return cached
+        except FileNotFoundError:
+            pass
+
+        built: Final[scene.Scene] = diagram.build(scenario)
+        metadata, data = scene.to_arrays(built)
+        # Data first, so that a scene.json is never there without its scene.npy.
+        if self._write(entry, _SCENE_DATA, lambda file: np.save(file, data)):
+            self._write(
+                entry,
+                _SCENE_METADATA,
+                lambda file: file.write(json.dumps(metadata).encode()),
+            )
+        return built
+
+    def image(self, scenario: Scenario, image_format: str = "png") -> bytes:
+        entry: Final[Path] = self._entry(scenario)
+        name: Final[str] = f"image.{image_format}"
+        try:
+            cached = (entry / name).read_bytes()
+            _touch(entry)
+            return cached
+        except FileNotFoundError:
+            pass
+
+        image: Final[bytes] = diagram.render(
+            scenario, image_format, self.scene(scenario), self._figures
+        )
+        self._write(entry, name, lambda file: file.write(image))
+        return image
+
+    def _entry(self, scenario: Scenario) -> Path:
+        return self._directory / key(scenario)
+
+    def _write(self, entry: Path, name: str, write: Callable[[BinaryIO], Any]) -> bool:
+        """
+        Writes a file of the entry, then evicts entries if needed. Returns False if the
+        entry got evicted by another process while writing: the file is then not cached.
+        """
+        try:
+            fd, tmp_path = self._create(entry)
+        except FileNotFoundError:
+            return False
+        # Write then rename, so that concurrent readers never see a partial file.
+        try:
+            with os.fdopen(fd, "wb") as file:
+                write(file)
+                size: Final[int] = file.tell()
+            os.replace(tmp_path, entry / name)
+        except FileNotFoundError:
+            return False  # evicted by another process
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        if self._size is None:
+            self._evict()
+        else:
+            self._size += size
+            if self._size > self._max_bytes:
+                self._evict()
+        return True
+
+    @staticmethod
+    def _create(entry: Path) -> tuple[int, str]:
+        """
+        Temporary file in the entry, creating the entry if needed. Another process may
+        evict the entry right after it got created, so that's tried twice.
+        """
+        try:
+            entry.mkdir(exist_ok=True)
+            return tempfile.mkstemp(dir=entry, prefix=".tmp-")
+        except FileNotFoundError:
+            entry.mkdir(exist_ok=True)
+            return tempfile.mkstemp(dir=entry, prefix=".tmp-")
+
+    def _evict(self) -> None:
+        entries: Final[list[tuple[float, int, Path]]] = []
+        for entry in self._directory.iterdir():
+            try:
+                entries.append(
+                    (
+                        entry.stat().st_mtime,
+                        sum(file.stat().st_size for file in entry.iterdir()),
+                        entry,
+                    )
+                )
+            except FileNotFoundError:
+                pass  # evicted by another process
+
+        total: int = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self._max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+        self._size = total
+
+
+def key(scenario: Scenario) -> str:
+    parameters: Final[str] = json.dumps(
+        dataclasses.asdict(scenario), sort_keys=True, default=str
+    )
+    return hashlib.sha256(f"{source_version()}\n{parameters}".encode()).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def source_version() -> str:
+    """
+    Hash of the source code, so that cached results get invalidated when it changes.
+    """
+    digest: Final[Any] = hashlib.sha256()
+    for path in sorted(Path(__file__).parent.glob("*.py")):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _touch(entry: Path) -> None:
+    try:
+        os.utime(entry)
+    except FileNotFoundError:
+        pass  # evicted by another process
@@ -0,0 +1,102 @@
+import io
+from math import ceil
+from typing import TYPE_CHECKING, Final
+
+from src import earthframe
+from src.figurepool import FigurePool
+from src import instrumentation
+from src import maths
+from src import plotting
+from src import renderer
+from src import scene
+from src import trajectoryframe
+from src import travelerframe
+from src import view
+from src.scenario import Scenario
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes  # type: ignore
+
+
+def draw(axes_earth: "Axes", axes_traveler: "Axes", scenario: Scenario) -> None:
+    renderer.draw(axes_earth, axes_traveler, build(scenario))
+
+
+def build(scenario: Scenario) -> scene.Scene:
+    with instrumentation.phase("diagram.build"):
+        return scene.Scene(
+            build_earth_frame(scenario),
+            build_traveler_frame(scenario),
+            scenario.traveler_end_age,
+            scenario.d_earth_from_planet,
+        )
+
+
+def build_earth_frame(scenario: Scenario) -> scene.Panel:
+    return earthframe.build(
+        scenario,
+        -2.0,
+        scenario.x_planet * 2.0,
+        scenario.t_reunion + 4.0,
+    )
+
+
+def build_traveler_frame(scenario: Scenario) -> scene.Panel:
+    return travelerframe.build(
+        scenario,
+        scenario.x_planet * -1.0,
+        2.0,
+        ceil(scenario.traveler_end_age / 2.0 + 1.0) * 2,
+    )
+
+
+def build_accelerated_frame(scenario: Scenario, acceleration: float) -> scene.Panel:
+    """
+    Earth frame of the same trip, with a constant proper acceleration [ly/y²] instead of
+    instant changes of speed.
+    """
+    from src.worldline import Trajectory
+
+    trajectory: Final[Trajectory] = Trajectory.round_trip(
+        scenario.x_planet, acceleration
+    )
+    return trajectoryframe.build(
+        scenario,
+        trajectory,
+        -2.0,
+        scenario.x_planet * 2.0,
+        float(trajectory.start_times[-1]) + 4.0,
+    )
+
+
+def build_observer_frame(scenario: Scenario, velocity: float) -> scene.Panel:
+    """
+    Earth frame panel, seen from an inertial observer moving at velocity along x.
+    """
+    return view.observe(
+        build_earth_frame(scenario), maths.Boost.from_velocity(velocity)
+    )
+
+
+def render(
+    scenario: Scenario,
+    image_format: str = "png",
+    diagram: scene.Scene | None = None,
+    figures: FigurePool | None = None,
+) -> bytes:
+    """
+    Renders the scenario to an image, in memory and without pyplot, so it can be called
+    from several threads at once. diagram is the scene of the scenario, if it's already
+    been built. With figures, a pooled figure gets reused instead of creating one.
+    """
+    if diagram is None:
+        diagram = build(scenario)
+    if figures is not None:
+        return figures.render(diagram, image_format)
+
+    figure, axes_earth, axes_traveler = plotting.new_figure()
+    renderer.draw(axes_earth, axes_traveler, diagram)
+    image: Final[io.BytesIO] = io.BytesIO()
+    with instrumentation.phase("diagram.savefig"):
+        figure.savefig(image, format=image_format)
+    return image.getvalue()
@@ -1,99 +1,57 @@
 from math import asin, ceil, cos, floor
-from typing import Any, Final
-
-from matplotlib.axes import Axes  # type: ignore
+from typing import Any, Final, Iterator
 
 import numpy as np
 
-from src import maths
+from src import instrumentation
 from src import plotting
+from src import scene
+from src.scenario import Scenario
+from src.worldline import Itinerary
+
+# Length marks and the traveler's ages on each leg share the marks of the panel.
+_MAX_MARKS: Final[int] = plotting.MAX_MARKS // 3
 
 
-def draw(
-    axes: Axes,
+def build(
+    scenario: Scenario,
     x_min: float,
     x_max: float,
     t_max: float,
-    t_reunion: float,
-    x_planet: float,
-    t_planet: float,
-    traveler_speed: float,
-    age_step: int,
-    margin: float,
-    color_traveler_first_leg: Any,
-    color_traveler_second_leg: Any,
-    color_earth: Any,
-    leg_width: int,
-    leg_style: str,
-) -> tuple[float, float]:
-    plotting.draw_axes(axes, "Earth frame", x_min, x_max, t_max, margin, "x", "t")
-
-    _draw_earth_explanation(
-        axes,
-        x_max,
-        t_max,
-        t_reunion,
-        x_planet,
-        traveler_speed,
-        color_earth,
-        leg_width,
-        leg_style,
-    )
-
-    traveler_age_on_planet, d_earth_from_planet = _draw_first_leg_explanation(
-        axes,
-        x_max,
-        margin,
-        x_planet,
-        t_planet,
-        traveler_speed,
-        age_step,
-        color_traveler_first_leg,
-        color_earth,
-        leg_width,
-        leg_style,
+) -> scene.Panel:
+    panel: Final[scene.PanelBuilder] = scene.PanelBuilder(
+        "Earth frame", x_min, x_max, t_max, scenario.margin, "x", "t"
     )
 
-    _draw_second_leg_explanation(
-        axes,
-        margin,
-        x_planet,
-        t_planet,
-        traveler_speed,
-        age_step,
-        color_traveler_second_leg,
-        color_earth,
-        leg_width,
-        leg_style,
-    )
+    with instrumentation.phase("earthframe.earth_explanation"):
+        _draw_earth_explanation(panel, scenario, x_max, t_max)
+    with instrumentation.phase("earthframe.first_leg_explanation"):
+        _draw_first_leg_explanation(panel, scenario, x_max)
+    with instrumentation.phase("earthframe.second_leg_explanation"):
+        _draw_second_leg_explanation(panel, scenario)
 
-    return 2.0 * traveler_age_on_planet, d_earth_from_planet
+    return panel.build()
 
 
 def _draw_earth_explanation(
-    axes: Axes,
+    panel: scene.PanelBuilder,
+    scenario: Scenario,
     x_max: float,
     t_max: float,
-    t_reunion: float,
-    x_planet: float,
-    traveler_speed: float,
-    color: Any,
-    leg_width: int,
-    leg_style: str,
 ) -> None:
-    earth_line_x: Final[Any] = np.linspace(0, 0)
-    earth_line_t: Final[Any] = np.linspace(0, t_reunion)
-    plotting.draw_line(
-        axes,
+    color: Final[Any] = scenario.color_earth
+    earth_line_x: Final[Any] = np.array([0, 0])
+    earth_line_t: Final[Any] = np.array([0, scenario.t_reunion])
+    panel.add_line(
         earth_line_x,
         earth_line_t,
         color,
-        leg_width,
-        leg_style,
+        scenario.leg_width,
+        scenario.leg_style,
+        kind="world_line",
     )
 
-    plotting.draw_axis(
-        axes,
+    panel.add_axis(
         "x",
         0,
         0,
@@ -101,16 +59,16 @@ def _draw_earth_explanation(
         0,
         plotting.darken(color),
     )
-    axes.annotate(
-        f"d={x_planet} ly; v={traveler_speed}",
-        xy=(x_planet, 0),
-        textcoords="offset fontsize",
-        xytext=(0, 0.5),
-        color=plotting.darken(color),
+    panel.annotate(
+        f"d={scenario.x_planet} ly; v={scenario.traveler_speed}",
+        scenario.x_planet,
+        0,
+        (0, 0.5),
+        plotting.darken(color),
+        kind="explanation",
     )
 
-    plotting.draw_axis(
-        axes,
+    panel.add_axis(
         "t",
         0,
         0,
@@ -121,31 +79,27 @@ def _draw_earth_explanation(
 
 
 def _draw_first_leg_explanation(
-    axes: Axes,
+    panel: scene.PanelBuilder,
+    scenario: Scenario,
     x_max: float,
-    margin: float,
-    x_planet: float,
-    t_planet: float,
-    traveler_speed: float,
-    age_step: int,
-    color_traveler: Any,
-    color_earth: Any,
-    leg_width: int,
-    leg_style: str,
-) -> tuple[float, float]:
-    traveler_x_first_leg: Final[Any] = np.linspace(0, x_planet)
+) -> None:
+    x_planet: Final[float] = scenario.x_planet
+    t_planet: Final[float] = scenario.t_planet
+    traveler_speed: Final[float] = scenario.traveler_speed
+    color_traveler: Final[Any] = scenario.color_traveler_first_leg
+
+    traveler_x_first_leg: Final[Any] = np.array([0, x_planet])
     traveler_t_first_leg: Final[Any] = traveler_x_first_leg / traveler_speed
-    plotting.draw_line(
-        axes,
+    panel.add_line(
         traveler_x_first_leg,
         traveler_t_first_leg,
         color_traveler,
-        leg_width,
-        leg_style,
+        scenario.leg_width,
+        scenario.leg_style,
+        kind="world_line",
     )
 
-    plotting.draw_axis(
-        axes,
+    panel.add_axis(
         "x'",
         0,
         0,
@@ -154,32 +108,32 @@ def _draw_first_leg_explanation(
         plotting.darken(color_traveler),
     )
     length_step: Final[int] = 2
-    for i in range(length_step, floor(x_max), length_step):
-        x_length_mark, t_length_mark = maths.lorentz_transform_prime_to_reference(
-            i,
-            0,
-            traveler_speed,
-        )
-        if x_length_mark > x_max:
-            break
-        plotting.draw_marker(
-            axes,
+    lengths: Final[Any] = plotting.marks(
+        length_step, floor(x_max), length_step, _MAX_MARKS
+    )
+    x_length_marks, t_length_marks = scenario.boost.inverse().apply_array(lengths, 0)
+    in_view: Final[Any] = x_length_marks <= x_max
+    for i, x_length_mark, t_length_mark in zip(
+        lengths[in_view], x_length_marks[in_view], t_length_marks[in_view]
+    ):
+        panel.add_marker(
             x_length_mark,
             t_length_mark,
             plotting.darken(color_traveler),
-            margin=margin,
+            margin=scenario.margin,
             shape="|",
+            kind="length_mark",
         )
-        axes.annotate(
+        panel.annotate(
             str(i),
-            xy=(x_length_mark, t_length_mark),
-            textcoords="offset fontsize",
-            xytext=(0.6, -0.8),
-            color=plotting.darken(color_traveler),
+            x_length_mark,
+            t_length_mark,
+            (0.6, -0.8),
+            plotting.darken(color_traveler),
+            kind="length_mark",
         )
 
-    plotting.draw_axis(
-        axes,
+    panel.add_axis(
         "t'",
         0,
         0,
@@ -189,103 +143,100 @@ def _draw_first_leg_explanation(
     )
 
     color_light: Final[str] = "green"
-    _, traveler_age_on_planet = maths.lorentz_transform_reference_to_prime(
-        x_planet,
-        t_planet,
-        traveler_speed,
-    )
-    for age in range(0, floor(traveler_age_on_planet / 2), age_step):
+    traveler_age_on_planet: Final[float] = scenario.traveler_age_on_planet
+    itinerary: Final[Itinerary] = scenario.itinerary
+    for age in plotting.marks(
+        0, floor(traveler_age_on_planet / 2), scenario.age_step, _MAX_MARKS
+    ):
         _draw_light_ray(
-            axes,
+            panel,
             0,
             age,
             x_planet * 1.2,
             age + x_planet * 1.2,
             color_light,
         )
-    axes.annotate(
+    panel.annotate(
         "light",
-        xy=(x_planet, x_planet),
-        textcoords="offset fontsize",
-        xytext=(0, -1),
-        color=plotting.darken(color_light),
+        x_planet,
+        x_planet,
+        (0, -1),
+        plotting.darken(color_light),
+        kind="light_ray",
     )
 
-    for age in range(age_step, floor(traveler_age_on_planet), age_step):
+    ages: Final[Any] = plotting.marks(
+        scenario.age_step, floor(traveler_age_on_planet), scenario.age_step, _MAX_MARKS
+    )
+    # The mark closest to half the Earth time of the turnaround: once the marks get
+    # decimated, that time is rarely one of them.
+    simultaneity_age: Final[float | None] = (
+        ages[np.argmin(np.abs(ages - t_planet / 2))] if len(ages) else None
+    )
+    for age, x, t, t_earth in _traveler_ages(itinerary, 0, ages):
         _draw_traveler_age(
-            axes,
-            True,
-            x_planet,
-            t_planet,
-            margin,
+            panel,
+            scenario,
             age,
-            traveler_speed,
+            x,
+            t,
+            t_earth,
             plotting.darken(color_traveler),
             color_light=color_light if age < traveler_age_on_planet / 2 else None,
-            annotate_simultaneity=(age == t_planet / 2),
+            annotate_simultaneity=(age == simultaneity_age),
         )
-    t_end_first_leg_on_earth, simultaneity_angle_deg = _draw_traveler_age(
-        axes,
-        True,
-        x_planet,
-        t_planet,
-        margin,
-        traveler_age_on_planet,
-        traveler_speed,
+    ((age, x, t, t_earth),) = _traveler_ages(itinerary, 0, [traveler_age_on_planet])
+    simultaneity_angle_deg: Final[float] = _draw_traveler_age(
+        panel,
+        scenario,
+        age,
+        x,
+        t,
+        t_earth,
         plotting.darken(color_traveler),
         None,
         plotting.darken(color_traveler),
-        plotting.darken(color_earth),
+        plotting.darken(scenario.color_earth),
     )
 
-    x1_earth_from_planet, _ = maths.lorentz_transform_reference_to_prime(
-        0,
-        t_end_first_leg_on_earth,
-        traveler_speed,
-    )
-    d_earth_from_planet = -x1_earth_from_planet
-    earth_speed_from_traveler = d_earth_from_planet / traveler_age_on_planet
-    axes.annotate(
+    d_earth_from_planet: Final[float] = scenario.d_earth_from_planet
+    earth_speed_from_traveler: Final[float] = scenario.earth_speed_from_traveler
+    panel.annotate(
         f"d={round(d_earth_from_planet, 1)} ly; v={round(earth_speed_from_traveler, 2)}",
-        xy=(0, t_end_first_leg_on_earth),
-        textcoords="offset fontsize",
-        xytext=(1, 1),
-        color=plotting.darken(color_traveler),
-        rotation=simultaneity_angle_deg + plotting.ROTATION_CORRECTION,
+        0,
+        scenario.t_end_first_leg_on_earth,
+        (1, 1),
+        plotting.darken(color_traveler),
+        simultaneity_angle_deg + plotting.ROTATION_CORRECTION,
+        kind="explanation",
     )
 
-    return traveler_age_on_planet, d_earth_from_planet
-
 
 def _draw_second_leg_explanation(
-    axes: Axes,
-    margin: float,
-    x_planet: float,
-    t_planet: float,
-    traveler_speed: float,
-    age_step: int,
-    color_traveler: Any,
-    color_earth: Any,
-    leg_width: int,
-    leg_style: str,
+    panel: scene.PanelBuilder,
+    scenario: Scenario,
 ) -> None:
-    traveler_x_second_leg: Final[Any] = np.linspace(x_planet, 0)
+    x_planet: Final[float] = scenario.x_planet
+    t_planet: Final[float] = scenario.t_planet
+    traveler_speed: Final[float] = scenario.traveler_speed
+    color_traveler: Final[Any] = scenario.color_traveler_second_leg
+
+    traveler_x_second_leg: Final[Any] = np.array([x_planet, 0])
     traveler_t_second_leg: Final[Any] = (
         t_planet + (x_planet - traveler_x_second_leg) / traveler_speed
     )
-    plotting.draw_line(
-        axes,
+    panel.add_line(
         traveler_x_second_leg,
         traveler_t_second_leg,
         color_traveler,
-        leg_width,
-        leg_style,
+        scenario.leg_width,
+        scenario.leg_style,
+        kind="world_line",
     )
 
     x2_axis_x_offset_after_planet: Final[float] = x_planet
     x2_axis_t_offset_after_planet: Final[float] = x_planet * -traveler_speed
-    plotting.draw_axis(
-        axes,
+    panel.add_axis(
         "x''",
         x_planet - x2_axis_x_offset_after_planet,
         t_planet - x2_axis_t_offset_after_planet,
@@ -293,8 +244,7 @@ def _draw_second_leg_explanation(
         2 * x2_axis_t_offset_after_planet,
         plotting.darken(color_traveler),
     )
-    plotting.draw_axis(
-        axes,
+    panel.add_axis(
         "t''",
         x_planet,
         t_planet,
@@ -303,121 +253,108 @@ def _draw_second_leg_explanation(
         plotting.darken(color_traveler),
     )
 
-    plotting.draw_marker(
-        axes,
+    panel.add_marker(
         x_planet - x2_axis_x_offset_after_planet,
         t_planet - x2_axis_t_offset_after_planet,
-        plotting.darken(color_earth),
+        plotting.darken(scenario.color_earth),
+        kind="turnaround",
     )
 
-    _, traveler_age_on_planet = maths.lorentz_transform_reference_to_prime(
-        x_planet,
-        t_planet,
-        traveler_speed,
+    ages: Final[Any] = plotting.marks(
+        ceil(scenario.traveler_age_on_planet),
+        ceil(scenario.traveler_end_age),
+        scenario.age_step,
+        _MAX_MARKS,
     )
-    for age in range(
-        ceil(traveler_age_on_planet), ceil(traveler_age_on_planet * 2), age_step
-    ):
+    for age, x, t, t_earth in _traveler_ages(scenario.itinerary, 1, ages):
         _draw_traveler_age(
-            axes,
-            False,
-            x_planet,
-            t_planet,
-            margin,
+            panel,
+            scenario,
             age,
-            traveler_speed,
+            x,
+            t,
+            t_earth,
             plotting.darken(color_traveler),
         )
 
 
+def _traveler_ages(
+    itinerary: Itinerary, leg: int, ages: Any
+) -> Iterator[tuple[float, float, float, float]]:
+    """
+    Yields each age with the traveler's (x, t) at that age during the leg, and the
+    Earth time simultaneous with it. All the ages are computed at once.
+    """
+    x, t = itinerary.events(ages, leg)
+    return zip(ages, x, t, itinerary.earth_times(ages, leg))
+
+
 def _draw_traveler_age(
-    axes: Axes,
-    first_leg: bool,
-    x_planet: float,
-    t_planet: float,
-    margin: float,
+    panel: scene.PanelBuilder,
+    scenario: Scenario,
     age: float,
-    speed: float,
+    traveler_age_x: float,
+    traveler_age_t: float,
+    simultaneous_t_on_earth: float,
     color,
     color_light=None,
     marker_traveler_color=None,
     marker_earth_color=None,
     annotate_simultaneity=False,
-) -> tuple[float, float]:
-    if first_leg:
-        traveler_age_x, traveler_age_t = maths.lorentz_transform_prime_to_reference(
-            0,
-            age,
-            speed,
-        )
-    else:
-        _, traveler_age_on_planet = maths.lorentz_transform_reference_to_prime(
-            x_planet,
-            t_planet,
-            speed,
-        )
-        traveler_age_x_from_planet, traveler_age_t_from_planet = (
-            maths.lorentz_transform_prime_to_reference(
-                0,
-                age - traveler_age_on_planet,
-                -speed,
-            )
-        )
-        traveler_age_x = x_planet + traveler_age_x_from_planet
-        traveler_age_t = t_planet + traveler_age_t_from_planet
-
+) -> float:
+    speed: Final[float] = scenario.traveler_speed
     simultaneous_x_on_earth: Final[float] = 0.0
-    simultaneous_t_on_earth: Final[float] = traveler_age_t + traveler_age_x * speed * (
-        -1 if first_leg else 1
-    )
 
-    plotting.draw_line(
-        axes,
+    panel.add_line(
         [traveler_age_x, simultaneous_x_on_earth],
         [traveler_age_t, simultaneous_t_on_earth],
         color,
         1,
         ":",
+        kind="simultaneity",
     )
-    axes.annotate(
+    panel.annotate(
         str(round(age, 1)),
-        xy=(traveler_age_x, traveler_age_t),
-        textcoords="offset fontsize",
-        xytext=(0.6, -0.4),
-        color=color,
+        traveler_age_x,
+        traveler_age_t,
+        (0.6, -0.4),
+        color,
+        kind="age_mark",
     )
     sin_angle: Final[float] = speed
     angle_rad: Final[float] = asin(sin_angle)
     angle_deg: Final[float] = angle_rad * 180 / np.pi
     cos_angle: Final[float] = cos(angle_rad)
     if annotate_simultaneity:
-        margin_text: Final[float] = margin
-        axes.text(
+        margin_text: Final[float] = scenario.margin
+        panel.annotate(
+            "traveler's simultaneity",
             traveler_age_x + cos_angle * margin_text,
             traveler_age_t + sin_angle * margin_text,
-            "traveler's simultaneity",
-            color=color,
-            rotation=angle_deg + plotting.ROTATION_CORRECTION,
+            (0, 0),
+            color,
+            angle_deg + plotting.ROTATION_CORRECTION,
+            kind="explanation",
         )
 
     if marker_traveler_color is not None:
-        plotting.draw_marker(
-            axes,
+        panel.add_marker(
             traveler_age_x,
             traveler_age_t,
             marker_traveler_color,
+            kind="turnaround",
         )
     if marker_earth_color is not None:
-        plotting.draw_marker(
-            axes,
+        panel.add_marker(
             simultaneous_x_on_earth,
             simultaneous_t_on_earth,
             marker_earth_color,
+            kind="turnaround",
         )
 
     if color_light is not None:
         _draw_light_ray(
-            axes,
+            panel,
             traveler_age_x,
             traveler_age_t,
             0,
@@ -425,22 +362,22 @@ def _draw_traveler_age(
             color_light,
         )
 
-    return simultaneous_t_on_earth, angle_deg
+    return angle_deg
 
 
 def _draw_light_ray(
-    axes: Axes,
+    panel: scene.PanelBuilder,
     x_start: float,
     t_start: float,
     x_end: float,
     t_end: float,
     color: Any,
 ) -> None:
-    plotting.draw_line(
-        axes,
+    panel.add_line(
         [x_start, x_end],
         [t_start, t_end],
         color,
         1,
         ":",
+        kind="light_ray",
     )
@@ -0,0 +1,119 @@
+import os
+from pathlib import Path
+from typing import Final, Iterator
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from src import maths
+
+# Same names and formulas as the Scenario properties, for whole arrays of travelers.
+FIELDS: Final[tuple[str, ...]] = (
+    "distance",
+    "speed",
+    "gamma",
+    "t_planet",
+    "t_reunion",
+    "traveler_age_on_planet",
+    "traveler_end_age",
+    # Earth twin's age minus traveler's age, at reunion.
+    "age_difference",
+    "t_end_first_leg_on_earth",
+    "t_begin_second_leg_on_earth",
+    # Earth time skipped by the traveler's simultaneity at turnaround.
+    "simultaneity_jump",
+    "d_earth_from_planet",
+)
+DTYPE: Final[np.dtype] = np.dtype([(field, np.float64) for field in FIELDS])
+
+DEFAULT_CHUNK_SIZE: Final[int] = 1 << 20
+
+
+def simulate(distances: ArrayLike, speeds: ArrayLike) -> NDArray[np.void]:
+    """
+    Quantities of the trips of many travelers, one per (distance, speed) pair, as a
+    structured array with FIELDS. Distances and speeds are broadcast against each other.
+    """
+    distances = np.asarray(distances, dtype=np.float64)
+    speeds = np.asarray(speeds, dtype=np.float64)
+    if np.any(distances <= 0):
+        raise ValueError("distances must be positive")
+    if np.any((speeds <= 0) | (speeds >= 1)):
+        raise ValueError("speeds must be between 0 and 1")
+    distances, speeds = np.broadcast_arrays(distances, speeds)
+
+    results: Final[NDArray[np.void]] = np.empty(distances.shape, dtype=DTYPE)
+    results["distance"] = distances
+    results["speed"] = speeds
+    results["gamma"] = 1 / np.sqrt(1 - speeds**2)
+    t_planet: Final[NDArray[np.float64]] = distances / speeds
+    results["t_planet"] = t_planet
+    results["t_reunion"] = 2 * t_planet
+    _, age_on_planet = maths.lorentz_transform_reference_to_prime_array(
+        distances, t_planet, speeds
+    )
+    results["traveler_age_on_planet"] = age_on_planet
+    results["traveler_end_age"] = 2.0 * age_on_planet
+    results["age_difference"] = results["t_reunion"] - results["traveler_end_age"]
+
+    x, t = maths.lorentz_transform_prime_to_reference_array(0, age_on_planet, speeds)
+    t_end_first_leg: Final[NDArray[np.float64]] = t - x * speeds
+    results["t_end_first_leg_on_earth"] = t_end_first_leg
+    t_begin_second_leg: Final[NDArray[np.float64]] = t_planet + distances * speeds
+    results["t_begin_second_leg_on_earth"] = t_begin_second_leg
+    results["simultaneity_jump"] = t_begin_second_leg - t_end_first_leg
+    x_earth, _ = maths.lorentz_transform_reference_to_prime_array(
+        0, t_end_first_leg, speeds
+    )
+    results["d_earth_from_planet"] = -x_earth
+    return results
+
+
+def simulate_chunks(
+    distances: ArrayLike,
+    speeds: ArrayLike,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[NDArray[np.void]]:
+    """
+    Same as simulate() for 1D inputs, chunk_size travelers at a time, so that memory
+    stays bounded however many travelers there are. Inputs can be memory-mapped.
+    """
+    distances, speeds = np.broadcast_arrays(distances, speeds)
+    if distances.ndim != 1:
+        raise ValueError("distances and speeds must be 1D")
+    for start in range(0, len(distances), chunk_size):
+        yield simulate(
+            distances[start : start + chunk_size], speeds[start : start + chunk_size]
+        )
+
+
+def save(
+    path: str | os.PathLike,
+    distances: ArrayLike,
+    speeds: ArrayLike,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> None:
+    """
+    Simulates the travelers chunk by chunk, streaming the results to a .npy file (as a
+    memory-mapped structured array) or to a .csv file with a header line.
+    """
+    distances, speeds = np.broadcast_arrays(distances, speeds)
+    chunks: Final[Iterator[NDArray[np.void]]] = simulate_chunks(
+        distances, speeds, chunk_size
+    )
+    path = Path(path)
+    if path.suffix == ".csv":
+        with open(path, "w") as file:
+            file.write(",".join(FIELDS) + "\n")
+            for chunk in chunks:
+                np.savetxt(file, chunk, fmt="%.12g", delimiter=",")
+        return
+
+    output: Final[NDArray[np.void]] = np.lib.format.open_memmap(
+        path, mode="w+", dtype=DTYPE, shape=distances.shape
+    )
+    start: int = 0
+    for chunk in chunks:
+        output[start : start + len(chunk)] = chunk
+        start += len(chunk)
+    output.flush()
@@ -0,0 +1,172 @@
+import json
+import os
+from pathlib import Path
+import shutil
+import tempfile
+from typing import Any, Callable, Final, Iterable
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src import diagram
+from src import scene
+from src.scenario import Scenario
+
+# Panels of a scene, indexed by the frame field.
+FRAMES: Final[tuple[str, ...]] = ("earth_frame", "traveler_frame")
+# Kinds of events, indexed by the kind field. "" is for untagged ones.
+KINDS: Final[tuple[str, ...]] = (
+    "",
+    # Vertices of the world lines: departure, turnaround and reunion.
+    "world_line",
+    "turnaround",
+    "age_mark",
+    "length_mark",
+    # Ends of the simultaneity lines, on the traveler's and on Earth's world line.
+    "simultaneity",
+    "light_ray",
+    "signal",
+    # Start and end of the axes, labelled with their name.
+    "axis",
+    "explanation",
+)
+DTYPE: Final[np.dtype] = np.dtype(
+    [
+        ("scene", np.uint32),
+        ("frame", np.uint8),
+        ("kind", np.uint8),
+        ("x", np.float64),
+        ("t", np.float64),
+        # Index in the label table, -1 for events without text.
+        ("label", np.int32),
+    ]
+)
+
+_KIND_INDICES: Final[dict[str, int]] = {kind: index for index, kind in enumerate(KINDS)}
+
+
+def events(
+    diagram: scene.Scene, labels: dict[str, int] | None = None, scene_index: int = 0
+) -> NDArray[np.void]:
+    """
+    Structured array with DTYPE of all the events of the scene: the vertices of its
+    lines, its markers, the ends of its axes and the positions of its texts. labels maps
+    the texts already in the label table to their index, and gets the new ones.
+    """
+    if labels is None:
+        labels = {}
+    return np.concatenate(
+        [
+            _panel_events(getattr(diagram, name), labels, scene_index, frame)
+            for frame, name in enumerate(FRAMES)
+        ]
+    )
+
+
+def save(
+    path: str | os.PathLike,
+    scenarios: Iterable[Scenario],
+    build: Callable[[Scenario], scene.Scene] = diagram.build,
+) -> None:
+    """
+    Writes the events of the scenes of the scenarios to a .npy file, to be opened
+    memory-mapped with load(). Events are streamed to disk scene by scene, so that
+    memory stays bounded however many scenarios there are. The label table and the
+    parameters of each scenario go to a .json file next to it, see sidecar_path().
+
+    build makes the scene of a scenario, e.g. Cache.scene() to reuse cached scenes.
+    """
+    path = Path(path)
+    labels: Final[dict[str, int]] = {}
+    parameters: Final[list[dict[str, Any]]] = []
+    count: int = 0
+    with tempfile.TemporaryFile(dir=path.parent) as data:
+        for scene_index, scenario in enumerate(scenarios):
+            rows = events(build(scenario), labels, scene_index)
+            data.write(rows.tobytes())
+            count += len(rows)
+            parameters.append(
+                {
+                    "x_planet": scenario.x_planet,
+                    "traveler_speed": scenario.traveler_speed,
+                    "age_step": scenario.age_step,
+                }
+            )
+
+        data.seek(0)
+        with open(path, "wb") as file:
+            np.lib.format.write_array_header_1_0(
+                file,
+                {
+                    "descr": np.lib.format.dtype_to_descr(DTYPE),
+                    "fortran_order": False,
+                    "shape": (count,),
+                },
+            )
+            shutil.copyfileobj(data, file)
+
+    sidecar_path(path).write_text(
+        json.dumps(
+            {
+                "frames": list(FRAMES),
+                "kinds": list(KINDS),
+                "labels": list(labels),
+                "scenarios": parameters,
+            }
+        )
+    )
+
+
+def load(path: str | os.PathLike) -> tuple[NDArray[np.void], dict[str, Any]]:
+    """
+    Events written by save(), memory-mapped, and the tables of their sidecar file:
+    frames, kinds, labels and scenarios, indexed by the fields of the same name.
+    """
+    return np.load(path, mmap_mode="r"), json.loads(sidecar_path(path).read_text())
+
+
+def sidecar_path(path: str | os.PathLike) -> Path:
+    """Path of the .json file with the tables of the events at path."""
+    return Path(path).with_suffix(".json")
+
+
+def _panel_events(
+    panel: scene.Panel, labels: dict[str, int], scene_index: int, frame: int
+) -> NDArray[np.void]:
+    # One (n, 2) array of positions per primitive, with a kind and a text per position.
+    positions: Final[list[NDArray[np.float64]]] = []
+    kinds: Final[list[str]] = []
+    texts: Final[list[str | None]] = []
+    for lines in panel.lines:
+        for line, kind in zip(lines.lines, lines.kinds):
+            positions.append(line)
+            kinds.extend([kind] * len(line))
+            texts.extend([None] * len(line))
+    for markers in panel.markers:
+        positions.append(markers.points)
+        kinds.extend(markers.kinds)
+        texts.extend([None] * len(markers.points))
+    for axis in panel.axes:
+        positions.append(np.stack((axis.start, axis.start + axis.offset)))
+        kinds.extend(["axis"] * 2)
+        texts.extend([axis.label] * 2)
+    for panel_labels in panel.labels:
+        positions.append(panel_labels.positions)
+        kinds.extend(panel_labels.kinds)
+        texts.extend(panel_labels.texts)
+
+    rows: Final[NDArray[np.void]] = np.empty(len(kinds), dtype=DTYPE)
+    rows["scene"] = scene_index
+    rows["frame"] = frame
+    try:
+        rows["kind"] = [_KIND_INDICES[kind] for kind in kinds]
+    except KeyError as error:
+        raise ValueError(f"unknown kind of event: {error}") from None
+    if positions:
+        x_t: Final[NDArray[np.float64]] = np.concatenate(positions)
+        rows["x"] = x_t[:, 0]
+        rows["t"] = x_t[:, 1]
+    rows["label"] = [
+        -1 if text is None else labels.setdefault(text, len(labels)) for text in texts
+    ]
+    return rows
@@ -0,0 +1,101 @@
+import io
+import threading
+from typing import TYPE_CHECKING, Any, Final
+
+from src import instrumentation
+from src import plotting
+from src import renderer
+from src import scene
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes  # type: ignore
+    from matplotlib.figure import Figure  # type: ignore
+
+
+class _PooledFigure:
+    def __init__(self) -> None:
+        figure, axes_earth, axes_traveler = plotting.new_figure()
+        self.figure: Final["Figure"] = figure
+        self.axes: Final[tuple["Axes", "Axes"]] = (axes_earth, axes_traveler)
+        # Frame key of each axes, None until its frame has been drawn.
+        self.frames: Final[list[renderer.FrameKey | None]] = [None, None]
+        # Artists of the last rendered scene, removed before rendering the next one.
+        self.artists: Final[list[Any]] = []
+
+
+class FigurePool:
+    """
+    Figures kept across renders: only the artists of the scenario get replaced, while
+    titles, axis labels, ticks and grid stay. Constrained layout only runs again when
+    the limits of a panel change. Different threads can render at once, each with its
+    own figure.
+    """
+
+    def __init__(self, max_figures: int = 1) -> None:
+        # Idle figures kept for later renders. More get created when all are in use.
+        self.max_figures: Final[int] = max_figures
+        self._idle: Final[list[_PooledFigure]] = []
+        self._lock: Final[threading.Lock] = threading.Lock()
+
+    @property
+    def figures(self) -> list["Figure"]:
+        """The idle figures, which the next renders will reuse."""
+        with self._lock:
+            return [pooled.figure for pooled in self._idle]
+
+    def render(self, diagram: scene.Scene, image_format: str = "png") -> bytes:
+        """
+        Same as diagram.render(), for an already built scene.
+        """
+        pooled: Final[_PooledFigure] = self._acquire()
+        # On error, the figure may be half drawn, so it's dropped instead of reused.
+        image: Final[bytes] = _render(pooled, diagram, image_format)
+        self._release(pooled)
+        return image
+
+    def _acquire(self) -> _PooledFigure:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return _PooledFigure()
+
+    def _release(self, pooled: _PooledFigure) -> None:
+        with self._lock:
+            if len(self._idle) < self.max_figures:
+                self._idle.append(pooled)
+
+
+def _render(pooled: _PooledFigure, diagram: scene.Scene, image_format: str) -> bytes:
+    with instrumentation.phase("figurepool.remove_artists"):
+        for artist in pooled.artists:
+            artist.remove()
+        pooled.artists.clear()
+
+    layout_changed: bool = False
+    for i, (axes, panel) in enumerate(
+        zip(pooled.axes, (diagram.earth_frame, diagram.traveler_frame))
+    ):
+        frame: renderer.FrameKey = renderer.frame_key(panel)
+        if frame != pooled.frames[i]:
+            renderer.draw_frame(axes, panel)
+            pooled.frames[i] = frame
+            layout_changed = True
+        with instrumentation.phase("renderer.draw_panel", axes):
+            pooled.artists.extend(renderer.draw_content(axes, panel))
+
+    if layout_changed:
+        # Constrained layout starts from where the axes are, so they're put back where
+        # a new figure has them first, to get the same layout. Setting the position
+        # takes the axes out of the layout, so they're put back in it.
+        for axes in pooled.axes:
+            axes.set_position(
+                axes.get_subplotspec().get_position(pooled.figure), which="both"
+            )
+            axes.set_in_layout(True)
+        pooled.figure.set_layout_engine(plotting.constrained_layout_engine())
+    image: Final[io.BytesIO] = io.BytesIO()
+    with instrumentation.phase("diagram.savefig"):
+        pooled.figure.savefig(image, format=image_format)
+    # Keeps the axes where constrained layout put them, until the limits change.
+    pooled.figure.set_layout_engine("none")
+    return image.getvalue()
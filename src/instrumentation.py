@@ -0,0 +1,160 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+import json
+import os
+import threading
+import time
+import tracemalloc
+from typing import Any, Final, Iterator
+
+
+@dataclass
+class Phase:
+    """
+    A timed phase of the drawing pipeline. start and duration are in seconds, start
+    being relative to the beginning of the recording. Nested phases have a higher depth.
+    """
+
+    name: str
+    start: float
+    duration: float
+    depth: int
+    pid: int
+    thread: int
+    # Number of artists created in the phase, by kind: lines, markers, texts and arrows.
+    artists: dict[str, int] = field(default_factory=dict)
+    # Net memory allocated by the phase, only when tracing allocations.
+    allocated_bytes: int | None = None
+
+
+class Recorder:
+    """
+    Collects phases while active, see record().
+    """
+
+    def __init__(
+        self, trace_allocations: bool = False, origin: float | None = None
+    ) -> None:
+        self.trace_allocations: Final[bool] = trace_allocations
+        self.phases: Final[list[Phase]] = []
+        # perf_counter() value at which phases start at 0.
+        self.origin: Final[float] = time.perf_counter() if origin is None else origin
+        self._lock: Final[threading.Lock] = threading.Lock()
+
+    def to_json(self) -> str:
+        return json.dumps([asdict(phase) for phase in self.phases], indent=2)
+
+    def to_trace(self) -> str:
+        """
+        The phases in the Trace Event Format, which can be opened with chrome://tracing,
+        Perfetto or speedscope to see them as a flame graph.
+        """
+        return json.dumps({"traceEvents": trace_events(self.phases)})
+
+    def _add(self, phase: Phase) -> None:
+        with self._lock:
+            self.phases.append(phase)
+
+
+def trace_events(phases: list[Phase]) -> list[dict[str, Any]]:
+    return [
+        {
+            "name": phase.name,
+            "ph": "X",
+            "ts": phase.start * 1e6,
+            "dur": phase.duration * 1e6,
+            "pid": phase.pid,
+            "tid": phase.thread,
+            "args": {
+                **phase.artists,
+                **(
+                    {}
+                    if phase.allocated_bytes is None
+                    else {"allocated_bytes": phase.allocated_bytes}
+                ),
+            },
+        }
+        for phase in phases
+    ]
+
+
+_recorder: Final[ContextVar[Recorder | None]] = ContextVar("recorder", default=None)
+_depth: Final[ContextVar[int]] = ContextVar("depth", default=0)
+
+
+@contextmanager
+def record(
+    trace_allocations: bool = False, origin: float | None = None
+) -> Iterator[Recorder]:
+    """
+    Records the phases run in the current context (thread or task) until exiting.
+    Tracing allocations uses tracemalloc, which slows everything down.
+    """
+    recorder: Final[Recorder] = Recorder(trace_allocations, origin)
+    token: Final[Any] = _recorder.set(recorder)
+    started_tracemalloc: Final[bool] = (
+        trace_allocations and not tracemalloc.is_tracing()
+    )
+    if started_tracemalloc:
+        tracemalloc.start()
+    try:
+        yield recorder
+    finally:
+        if started_tracemalloc:
+            tracemalloc.stop()
+        _recorder.reset(token)
+
+
+@contextmanager
+def phase(name: str, axes: Any = None) -> Iterator[None]:
+    """
+    Times the enclosed code as a phase, when recording. If axes is given, the artists
+    added to it in the phase are counted.
+    """
+    recorder: Final[Recorder | None] = _recorder.get()
+    if recorder is None:
+        yield
+        return
+
+    artists_before: Final[dict[str, int]] = _count_artists(axes)
+    depth: Final[int] = _depth.get()
+    depth_token: Final[Any] = _depth.set(depth + 1)
+    if recorder.trace_allocations:
+        allocated_before, _ = tracemalloc.get_traced_memory()
+    start: Final[float] = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration: Final[float] = time.perf_counter() - start
+        _depth.reset(depth_token)
+        recorded = Phase(
+            name,
+            start - recorder.origin,
+            duration,
+            depth,
+            os.getpid(),
+            threading.get_ident(),
+            {
+                kind: count - artists_before[kind]
+                for kind, count in _count_artists(axes).items()
+            },
+        )
+        if recorder.trace_allocations:
+            allocated_after, _ = tracemalloc.get_traced_memory()
+            recorded.allocated_bytes = allocated_after - allocated_before
+        recorder._add(recorded)
+
+
+def _count_artists(axes: Any) -> dict[str, int]:
+    if axes is None:
+        return {}
+    collections: Final[list[str]] = [
+        type(collection).__name__ for collection in axes.collections
+    ]
+    return {
+        "lines": len(axes.lines) + collections.count("LineCollection"),
+        "markers": collections.count("PathCollection"),
+        "texts": len(axes.texts),
+        "arrows": len(axes.patches),
+    }
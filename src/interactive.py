@@ -0,0 +1,181 @@
+from dataclasses import replace
+from typing import Any, Final
+
+from src import diagram
+from src import plotting
+from src import renderer
+from src import scene
+from src.scenario import Scenario
+
+# Room left at the bottom of the figure for the sliders, as a fraction of its height.
+_SLIDERS_HEIGHT: Final[float] = 0.12
+
+
+class Explorer:
+    """
+    Shows the scenario with sliders for the distance to the planet, the traveler speed
+    and the age step. Must be kept referenced while shown.
+
+    Moving a slider rebuilds the scene and updates the artists in place. The artists of
+    the content and the moving parts of the sliders are animated: an update only draws
+    them again over a copy of the rest of the figure (blitting). While a slider is
+    dragged, the limits, ticks and grid stay as they are, as changing them takes a full
+    redraw, and the texts are left out, as laying them out takes longer than a display
+    frame: both follow the scene once the slider is released. Slider events that come
+    faster than updates get coalesced.
+    """
+
+    def __init__(self, scenario: Scenario) -> None:
+        from matplotlib.widgets import Slider  # type: ignore
+
+        axes_earth, axes_traveler = plotting.draw_figure()
+        self.figure: Final[Any] = axes_earth.figure
+        self._layout: Final[Any] = self.figure.get_layout_engine()
+        self._layout.set(rect=(0, _SLIDERS_HEIGHT, 1, 1))
+        canvas: Final[Any] = self.figure.canvas
+        # Copy of the figure without its animated artists, taken on each full draw.
+        self._background: Any = None
+        # Whether slider values changed since the last update, see _on_changed().
+        self._pending: bool = False
+        self._timer: Final[Any] = canvas.new_timer(interval=1)
+        self._timer.single_shot = True
+        self._timer.add_callback(self._flush)
+
+        self.scenario: Scenario = scenario
+        self._earth_frame: Final[renderer.PanelArtists] = renderer.PanelArtists(
+            axes_earth, animated=True
+        )
+        self._traveler_frame: Final[renderer.PanelArtists] = renderer.PanelArtists(
+            axes_traveler, animated=True
+        )
+
+        def slider(row: int, label: str, **kwargs: Any) -> Any:
+            axes = self.figure.add_axes(
+                (0.2, (_SLIDERS_HEIGHT - 0.01) * (3 - row) / 3 - 0.02, 0.6, 0.02)
+            )
+            # valfmt keeps the values away from mathtext, which is slow to lay out.
+            slider = Slider(axes, label, **kwargs)
+            # Drawn by _blit(), instead of a full redraw on each change. The lines are
+            # the initial value and the handle, drawn over the bar.
+            slider.drawon = False
+            for artist in (slider.poly, *axes.lines, slider.valtext):
+                artist.set_animated(True)
+            slider.on_changed(self._on_changed)
+            return slider
+
+        self._x_planet: Final[Any] = slider(
+            0,
+            "distance [ly]",
+            valmin=1.0,
+            valmax=50.0,
+            valinit=scenario.x_planet,
+            valfmt="%.1f",
+        )
+        self._traveler_speed: Final[Any] = slider(
+            1,
+            "speed [c]",
+            valmin=0.05,
+            valmax=0.95,
+            valinit=scenario.traveler_speed,
+            valfmt="%.2f",
+        )
+        self._age_step: Final[Any] = slider(
+            2,
+            "age step [y]",
+            valmin=1,
+            valmax=5,
+            valinit=scenario.age_step,
+            valstep=1,
+            valfmt="%d",
+        )
+        self._sliders: Final[list[Any]] = [
+            self._x_planet,
+            self._traveler_speed,
+            self._age_step,
+        ]
+
+        self._diagram: scene.Scene = diagram.build(scenario)
+        self._earth_frame.update(self._diagram.earth_frame)
+        self._traveler_frame.update(self._diagram.traveler_frame)
+
+        # Connected last, as creating the sliders may already draw the figure.
+        # Constrained layout only runs on the first draw, and again when the limits
+        # change, see _update_frames(). Running it on each update would take longer
+        # than the update itself.
+        self._connection: int = canvas.mpl_connect("draw_event", self._freeze_layout)
+        canvas.mpl_connect("draw_event", self._on_draw)
+        canvas.mpl_connect("button_release_event", self._on_release)
+
+    def _on_changed(self, _value: float) -> None:
+        # The update runs once the events already queued are handled, with the last
+        # values of the sliders.
+        self._pending = True
+        self._timer.start()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        self._pending = False
+        scenario: Final[Scenario] = replace(
+            self.scenario,
+            x_planet=float(self._x_planet.val),
+            traveler_speed=float(self._traveler_speed.val),
+            age_step=int(self._age_step.val),
+        )
+        if scenario != self.scenario:
+            self.scenario = scenario
+            self._diagram = diagram.build(scenario)
+            self._earth_frame.update_content(self._diagram.earth_frame)
+            self._traveler_frame.update_content(self._diagram.traveler_frame)
+        if any(slider.drag_active for slider in self._sliders):
+            self._blit(texts=False)
+        else:
+            self._update_frames()
+
+    def _on_release(self, _event: Any) -> None:
+        self._flush()
+        self._update_frames()
+
+    def _update_frames(self) -> None:
+        earth_changed: Final[bool] = self._earth_frame.update_frame(
+            self._diagram.earth_frame
+        )
+        traveler_changed: Final[bool] = self._traveler_frame.update_frame(
+            self._diagram.traveler_frame
+        )
+        if earth_changed or traveler_changed:
+            # The tick labels may now take more or less room.
+            self.figure.set_layout_engine(self._layout)
+            self._connection = self.figure.canvas.mpl_connect(
+                "draw_event", self._freeze_layout
+            )
+            self.figure.canvas.draw_idle()
+        else:
+            self._blit()
+
+    def _blit(self, texts: bool = True) -> None:
+        if self._background is None:
+            self.figure.canvas.draw_idle()
+            return
+        canvas: Final[Any] = self.figure.canvas
+        canvas.restore_region(self._background)
+        self._draw_animated(texts)
+        canvas.blit(self.figure.bbox)
+
+    def _on_draw(self, _event: Any) -> None:
+        self._background = self.figure.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self, texts: bool = True) -> None:
+        from matplotlib.text import Text  # type: ignore
+
+        for artist in (*self._earth_frame.artists, *self._traveler_frame.artists):
+            if texts or not isinstance(artist, Text):
+                self.figure.draw_artist(artist)
+        for slider in self._sliders:
+            for artist in (slider.poly, *slider.ax.lines, slider.valtext):
+                self.figure.draw_artist(artist)
+
+    def _freeze_layout(self, _event: Any) -> None:
+        self.figure.set_layout_engine("none")
+        self.figure.canvas.mpl_disconnect(self._connection)
@@ -1,5 +1,21 @@
-from math import sqrt
-from typing import Tuple
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from math import atanh, cosh, sinh, sqrt, tanh
+from typing import TYPE_CHECKING, Tuple
+
+# NumPy is imported where needed, so that the scalar functions load fast.
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import ArrayLike, NDArray
+
+
+@lru_cache(maxsize=256)
+def gamma(v: float) -> float:
+    """
+    Lorentz factor for speed v (fraction of the speed of light). Memoized, as the same
+    few speeds are used for all the events of a diagram.
+    """
+    return 1 / sqrt(1 - v**2)
 
 
 def lorentz_transform_prime_to_reference(
@@ -13,9 +29,9 @@ def lorentz_transform_prime_to_reference(
     * t, t': T
     * v: no unit, fraction of the speed of light
     """
-    gamma = 1 / sqrt(1 - v**2)
-    t1 = gamma * (t2 + v * x2)
-    x1 = gamma * (x2 + v * t2)
+    g = gamma(v)
+    t1 = g * (t2 + v * x2)
+    x1 = g * (x2 + v * t2)
     return x1, t1
 
 
@@ -30,7 +46,107 @@ def lorentz_transform_reference_to_prime(
     * t, t': T
     * v: no unit, fraction of the speed of light
     """
-    gamma = 1 / sqrt(1 - v**2)
-    t2 = gamma * (t1 - v * x1)
-    x2 = gamma * (x1 - v * t1)
+    g = gamma(v)
+    t2 = g * (t1 - v * x1)
+    x2 = g * (x1 - v * t1)
+    return x2, t2
+
+
+def lorentz_transform_prime_to_reference_array(
+    x2: "ArrayLike", t2: "ArrayLike", v: "ArrayLike"
+) -> Tuple["NDArray[np.float64]", "NDArray[np.float64]"]:
+    """
+    Array version of lorentz_transform_prime_to_reference(). x', t' and v are broadcast
+    against each other, so many events and/or many speeds are transformed at once.
+    """
+    import numpy as np
+
+    x2 = np.asarray(x2, dtype=np.float64)
+    t2 = np.asarray(t2, dtype=np.float64)
+    v = np.asarray(v, dtype=np.float64)
+    g = 1 / np.sqrt(1 - v**2)
+    t1 = g * (t2 + v * x2)
+    x1 = g * (x2 + v * t2)
+    return x1, t1
+
+
+def lorentz_transform_reference_to_prime_array(
+    x1: "ArrayLike", t1: "ArrayLike", v: "ArrayLike"
+) -> Tuple["NDArray[np.float64]", "NDArray[np.float64]"]:
+    """
+    Array version of lorentz_transform_reference_to_prime(). x, t and v are broadcast
+    against each other, so many events and/or many speeds are transformed at once.
+    """
+    import numpy as np
+
+    x1 = np.asarray(x1, dtype=np.float64)
+    t1 = np.asarray(t1, dtype=np.float64)
+    v = np.asarray(v, dtype=np.float64)
+    g = 1 / np.sqrt(1 - v**2)
+    t2 = g * (t1 - v * x1)
+    x2 = g * (x1 - v * t1)
     return x2, t2
+
+
+@dataclass(frozen=True)
+class Boost:
+    """
+    Lorentz boost to a frame moving along x, given by its rapidity: (x, t) in the
+    reference frame to (x', t') in the moving frame. Rapidities add up when composing
+    boosts, so a chain of frame changes is a single boost, without the precision lost
+    by going through speeds and gamma = 1/sqrt(1 - v**2) when v is close to 1.
+    """
+
+    rapidity: float = 0.0
+
+    @classmethod
+    def from_velocity(cls, v: float) -> "Boost":
+        return cls(atanh(v))
+
+    @cached_property
+    def velocity(self) -> float:
+        return tanh(self.rapidity)
+
+    @cached_property
+    def gamma(self) -> float:
+        return cosh(self.rapidity)
+
+    @cached_property
+    def gamma_velocity(self) -> float:
+        """gamma * v, accurate even when gamma is large."""
+        return sinh(self.rapidity)
+
+    def compose(self, other: "Boost") -> "Boost":
+        """Boost by self, then by other, from the frame boosted to by self."""
+        return Boost(self.rapidity + other.rapidity)
+
+    def inverse(self) -> "Boost":
+        return Boost(-self.rapidity)
+
+    def matrix(self) -> "NDArray[np.float64]":
+        """2x2 matrix of the boost, applying to (x, t) column vectors."""
+        import numpy as np
+
+        return np.array(
+            [[self.gamma, -self.gamma_velocity], [-self.gamma_velocity, self.gamma]]
+        )
+
+    def apply(self, x1: float, t1: float) -> Tuple[float, float]:
+        """Same as lorentz_transform_reference_to_prime() at the boost's velocity."""
+        return (
+            self.gamma * x1 - self.gamma_velocity * t1,
+            self.gamma * t1 - self.gamma_velocity * x1,
+        )
+
+    def apply_array(
+        self, x1: "ArrayLike", t1: "ArrayLike"
+    ) -> Tuple["NDArray[np.float64]", "NDArray[np.float64]"]:
+        """Array version of apply(), x and t being broadcast against each other."""
+        import numpy as np
+
+        x1 = np.asarray(x1, dtype=np.float64)
+        t1 = np.asarray(t1, dtype=np.float64)
+        return (
+            self.gamma * x1 - self.gamma_velocity * t1,
+            self.gamma * t1 - self.gamma_velocity * x1,
+        )
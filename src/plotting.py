@@ -1,29 +1,87 @@
 import colorsys
-from typing import Final
+from functools import lru_cache
+from math import ceil
+from typing import TYPE_CHECKING, Any, Final
 
-import matplotlib.pyplot as plt  # type: ignore
-from matplotlib.axes import Axes  # type: ignore
-from matplotlib.colors import to_rgb  # type: ignore
 import numpy as np
 
+from src import instrumentation
+
+# matplotlib is imported where needed, as importing it is slow.
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes  # type: ignore
+    from matplotlib.figure import Figure  # type: ignore
 
 # NOTE(aurelien): Not sure why this leads to better results.
 ROTATION_CORRECTION = -3  # degrees
 
+# At most this many marks with a text per panel, so that long trips don't get
+# thousands of texts. Panels with several series of marks split it between them, see
+# marks().
+MAX_MARKS: Final[int] = 60
 
-def draw_figure() -> tuple[Axes, Axes]:
-    _fig, (axes1, axes2) = plt.subplots(
-        1,
-        2,
-        # sharey=True,
-        figsize=(15, 12),
-        layout="constrained",
-        facecolor="lightgray",
-    )
+# Smallest distance between tick labels, in font sizes: the ones of t are stacked, the
+# ones of x are side by side and need room for their digits.
+_TICK_LABEL_HEIGHT: Final[float] = 1.5
+_TICK_LABEL_DIGIT_WIDTH: Final[float] = 0.65
+# Smallest distance between minor grid lines [pixels].
+_MIN_MINOR_TICK_SPACING: Final[float] = 5.0
+
+
+def constrained_layout_engine() -> Any:
+    return _constrained_layout_engine_class()()
+
+
+@lru_cache(maxsize=1)
+def _constrained_layout_engine_class() -> Any:
+    from matplotlib.layout_engine import ConstrainedLayoutEngine  # type: ignore
+
+    class _ConstrainedLayoutEngine(ConstrainedLayoutEngine):
+        # Constrained layout runs when the figure gets drawn, so it's timed here.
+        def execute(self, fig):
+            with instrumentation.phase("plotting.constrained_layout"):
+                return super().execute(fig)
+
+    return _ConstrainedLayoutEngine
+
+
+def draw_figure() -> tuple["Axes", "Axes"]:
+    import matplotlib.pyplot as plt  # type: ignore
+
+    with instrumentation.phase("plotting.draw_figure"):
+        _fig, (axes1, axes2) = plt.subplots(
+            1,
+            2,
+            # sharey=True,
+            figsize=(15, 12),
+            layout=constrained_layout_engine(),
+            facecolor="lightgray",
+        )
 
     return axes1, axes2
 
 
+def new_figure() -> tuple["Figure", "Axes", "Axes"]:
+    """
+    Same as draw_figure(), but the figure isn't registered with pyplot: it's rendered
+    with its own Agg canvas and freed as soon as it's no longer referenced. Different
+    figures can be drawn concurrently from different threads.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg  # type: ignore
+    from matplotlib.figure import Figure  # type: ignore
+
+    with instrumentation.phase("plotting.new_figure"):
+        figure: Final[Figure] = Figure(
+            figsize=(15, 12),
+            layout=constrained_layout_engine(),
+            facecolor="lightgray",
+        )
+        FigureCanvasAgg(figure)
+        axes1, axes2 = figure.subplots(1, 2)
+
+    return figure, axes1, axes2
+
+
 def draw_axes(
     axes, title, xmin, xmax, ymax, margin, xname="x", yname="t", xunit="ly", yunit="y"
 ) -> None:
@@ -37,12 +95,14 @@ def draw_axes(
 
     axes.set_xlim(xmin - margin, xmax + margin)
     axes.set_ylim(-margin, ymax + margin)
-    tick_granularity: Final[float] = 2.0
-    minor_tick_granularity: Final[float] = 1.0
-    axes.set_xticks(np.arange(xmin, xmax + tick_granularity, tick_granularity))
+    tick_granularity, minor_tick_granularity = _tick_steps(
+        axes, xmin, xmax, ymax, margin
+    )
+    xstart: Final[float] = ceil(xmin / tick_granularity) * tick_granularity
+    axes.set_xticks(np.arange(xstart, xmax + tick_granularity, tick_granularity))
     axes.set_yticks(np.arange(0, ymax + tick_granularity, tick_granularity))
     axes.set_xticks(
-        np.arange(xmin, xmax + minor_tick_granularity, minor_tick_granularity),
+        np.arange(xstart, xmax + minor_tick_granularity, minor_tick_granularity),
         minor=True,
     )
     axes.set_yticks(
@@ -50,49 +110,107 @@ def draw_axes(
     )
     axes.set_aspect("equal")  # aspect ratio of 1:1
 
-    axes.grid()
+    axes.grid(True)
     # axes.legend()
 
 
-def draw_line(axes, data_x, data_y, color, width, style) -> None:
-    axes.plot(
+def _tick_steps(axes, xmin, xmax, ymax, margin) -> tuple[int, int]:
+    """
+    Steps of the major and minor ticks, 2 and 1 unless the axes are too small for the
+    limits: the labels of the major ticks mustn't overlap, and minor grid lines must be
+    _MIN_MINOR_TICK_SPACING pixels apart at the resolution of the figure.
+    """
+    from matplotlib.font_manager import FontProperties  # type: ignore
+    import matplotlib as mpl  # type: ignore
+
+    # Data units are as long in x as in t, as the aspect is equal.
+    figure_width, figure_height = axes.figure.get_size_inches()
+    # The position given by the grid, rather than the one left by the layout of the
+    # last draw, so that reused figures get the same ticks as new ones.
+    position: Final[Any] = axes.get_subplotspec().get_position(axes.figure)
+    points_per_unit: Final[float] = 72 * min(
+        position.width * figure_width / (xmax - xmin + 2 * margin),
+        position.height * figure_height / (ymax + 2 * margin),
+    )
+    font_size: Final[float] = FontProperties(
+        size=mpl.rcParams["xtick.labelsize"]
+    ).get_size_in_points()
+    digits: Final[int] = max(len(str(round(value))) for value in (xmin, xmax, ymax))
+    label_spacing: Final[float] = font_size * max(
+        _TICK_LABEL_HEIGHT, _TICK_LABEL_DIGIT_WIDTH * (digits + 1)
+    )
+
+    step: Final[int] = max(2, nice_step(label_spacing / points_per_unit))
+    minor_step: Final[int] = step // 5 if str(step).startswith("5") else step // 2
+    pixels_per_unit: Final[float] = points_per_unit * axes.figure.dpi / 72
+    if minor_step * pixels_per_unit < _MIN_MINOR_TICK_SPACING:
+        return step, step
+    return step, minor_step
+
+
+def nice_step(value: float) -> int:
+    """Smallest of 1, 2, 5, 10, 20, 50, 100... that is at least value."""
+    power: int = 1
+    while True:
+        for factor in (1, 2, 5):
+            if factor * power >= value:
+                return factor * power
+        power *= 10
+
+
+def marks(start: float, stop: float, step: int, max_count: int = MAX_MARKS) -> Any:
+    """
+    Same as np.arange(start, stop, step), but with at most max_count values: if there
+    would be more, step gets multiplied by 2, 5, 10, 20... and the values are the
+    multiples of that new step.
+    """
+    if (stop - start) / step <= max_count:
+        return np.arange(start, stop, step)
+    step *= nice_step((stop - start) / (step * (max_count - 1)))
+    return np.arange(ceil(start / step) * step, stop, step)
+
+
+def draw_lines(axes, lines, color, width, style) -> Any:
+    from matplotlib.collections import LineCollection  # type: ignore
+
+    return axes.add_collection(
+        LineCollection(
+            lines,
+            colors=[color],
+            linewidths=width,
+            linestyles=style,
+            # Same caps as Line2D.
+            capstyle="projecting" if style == "-" else "butt",
+            zorder=20,
+        ),
+        autolim=False,
+    )
+
+
+def draw_markers(axes, data_x, data_y, color, shape) -> Any:
+    marker_size: Final[float] = 6.0  # points, as for Line2D
+    return axes.scatter(
         data_x,
         data_y,
-        # label="Earth",
+        s=marker_size**2,
+        marker=shape,
         color=color,
-        linewidth=width,
-        linestyle=style,
-        zorder=20,
+        linewidths=1.0,
+        zorder=30,
     )
 
 
-def draw_marker(
-    axes,
-    x,
-    y,
-    color,
-    label: str | None = None,
-    margin=0.0,
-    shape="s",  # square
-) -> None:
+def draw_label(axes, text, x, y, text_offset, color, rotation=0.0, arrow=False) -> Any:
     arrow_head_size: Final[int] = 7
-    axes.plot(
-        [x],
-        [y],
-        shape,
-        label=label,
+    return axes.annotate(
+        text,
+        xy=(x, y),
+        textcoords="offset fontsize",
+        xytext=text_offset,
         color=color,
-        zorder=30,
-    )
-
-    if label is not None:
-        axes.annotate(
-            label,
-            xy=(x, y + margin),
-            textcoords="offset fontsize",
-            xytext=(-4, 5.2),
-            color=color,
-            arrowprops=dict(
+        rotation=rotation,
+        arrowprops=(
+            dict(
                 # arrowstyle="fancy",
                 # relpos=(10, -10),
                 color=color,
@@ -100,13 +218,16 @@ def draw_marker(
                 headwidth=arrow_head_size,
                 headlength=arrow_head_size,
                 # shrink=0.5,
-            ),
-        )
+            )
+            if arrow
+            else None
+        ),
+    )
 
 
-def draw_axis(axes, label, x_start, y_start, x_offset, y_offset, color) -> None:
+def draw_axis(axes, label, x_start, y_start, x_offset, y_offset, color) -> list[Any]:
     # See https://matplotlib.org/stable/api/_as_gen/matplotlib.pyplot.arrow.html
-    axes.arrow(
+    arrow: Final[Any] = axes.arrow(
         x_start,
         y_start,
         x_offset,
@@ -118,16 +239,20 @@ def draw_axis(axes, label, x_start, y_start, x_offset, y_offset, color) -> None:
         zorder=10,
     )
 
-    axes.annotate(
+    annotation: Final[Any] = axes.annotate(
         label,
         xy=(x_start + x_offset, y_start + y_offset),
         textcoords="offset fontsize",
         xytext=(-0.5, 0.5),
         color=color,
     )
+    return [arrow, annotation]
 
 
+@lru_cache(maxsize=64)
 def darken(color: str):
+    from matplotlib.colors import to_rgb  # type: ignore
+
     # See https://stackoverflow.com/questions/37765197/darken-or-lighten-a-color-in-matplotlib
     h, l, s = colorsys.rgb_to_hls(*to_rgb(color))
     scale_l: Final[float] = 0.6
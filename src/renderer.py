@@ -0,0 +1,287 @@
+from typing import TYPE_CHECKING, Any, Final
+
+from src import instrumentation
+from src import plotting
+from src import scene
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes  # type: ignore
+
+# What draw_frame() depends on. Panels with the same frame key share their title, axis
+# labels, ticks and grid.
+FrameKey = tuple[str, float, float, float, float, str, str]
+
+
+def draw(axes_earth: "Axes", axes_traveler: "Axes", diagram: scene.Scene) -> None:
+    draw_panel(axes_earth, diagram.earth_frame)
+    draw_panel(axes_traveler, diagram.traveler_frame)
+
+
+def draw_panel(axes: "Axes", panel: scene.Panel) -> list[Any]:
+    with instrumentation.phase("renderer.draw_panel", axes):
+        draw_frame(axes, panel)
+        return draw_content(axes, panel)
+
+
+def draw_frame(axes: "Axes", panel: scene.Panel) -> None:
+    """
+    Draws what only depends on the limits of the panel: title, axis labels, ticks and
+    grid.
+    """
+    with instrumentation.phase("plotting.draw_axes", axes):
+        plotting.draw_axes(
+            axes,
+            panel.title,
+            panel.x_min,
+            panel.x_max,
+            panel.t_max,
+            panel.margin,
+            panel.x_name,
+            panel.t_name,
+        )
+
+
+def frame_key(panel: scene.Panel) -> FrameKey:
+    return (
+        panel.title,
+        panel.x_min,
+        panel.x_max,
+        panel.t_max,
+        panel.margin,
+        panel.x_name,
+        panel.t_name,
+    )
+
+
+def draw_content(axes: "Axes", panel: scene.Panel) -> list[Any]:
+    """
+    Draws the lines, markers, axes and labels of the panel, and returns the created
+    artists.
+    """
+    artists: Final[list[Any]] = []
+
+    with instrumentation.phase("renderer.lines", axes):
+        for lines in panel.lines:
+            artists.append(
+                plotting.draw_lines(
+                    axes, lines.lines, lines.color, lines.width, lines.style
+                )
+            )
+
+    with instrumentation.phase("renderer.markers", axes):
+        for markers in panel.markers:
+            artists.append(
+                plotting.draw_markers(
+                    axes,
+                    markers.points[:, 0],
+                    markers.points[:, 1],
+                    markers.color,
+                    markers.shape,
+                )
+            )
+
+    with instrumentation.phase("renderer.axes", axes):
+        for axis in panel.axes:
+            artists.extend(
+                plotting.draw_axis(
+                    axes,
+                    axis.label,
+                    axis.start[0],
+                    axis.start[1],
+                    axis.offset[0],
+                    axis.offset[1],
+                    axis.color,
+                )
+            )
+
+    with instrumentation.phase("renderer.labels", axes):
+        for labels in panel.labels:
+            for text, (x, t) in zip(labels.texts, labels.positions):
+                artists.append(
+                    plotting.draw_label(
+                        axes,
+                        text,
+                        x,
+                        t,
+                        labels.text_offset,
+                        labels.color,
+                        labels.rotation,
+                        labels.arrow,
+                    )
+                )
+
+    return artists
+
+
+class PanelArtists:
+    """
+    Artists showing a panel on axes, updated in place when showing another panel:
+    artists of the same style get reused, the missing ones get created and the ones
+    left over get removed. The frame only gets drawn again when its limits change.
+
+    If animated is set, the artists of the content are animated: they're left out of
+    the draws of the figure, to be drawn over a copy of the rest of it, see artists.
+    """
+
+    def __init__(self, axes: "Axes", animated: bool = False) -> None:
+        self._axes: Final["Axes"] = axes
+        self._animated: Final[bool] = animated
+        self._frame: FrameKey | None = None
+        self._lines: dict[tuple[Any, float, str], Any] = {}
+        self._markers: dict[tuple[Any, str], Any] = {}
+        # Arrow and annotation of each axis.
+        self._axes_artists: list[list[Any]] = []
+        # Annotations, with and without arrows.
+        self._labels: dict[bool, list[Any]] = {False: [], True: []}
+
+    @property
+    def artists(self) -> list[Any]:
+        """Artists of the content, in the order they get drawn."""
+        return sorted(
+            [
+                *self._lines.values(),
+                *self._markers.values(),
+                *(artist for artists in self._axes_artists for artist in artists),
+                *self._labels[False],
+                *self._labels[True],
+            ],
+            key=lambda artist: artist.get_zorder(),
+        )
+
+    def update(self, panel: scene.Panel) -> None:
+        with instrumentation.phase("renderer.update_panel", self._axes):
+            self.update_frame(panel)
+            self.update_content(panel)
+
+    def update_frame(self, panel: scene.Panel) -> bool:
+        """
+        Draws the frame of the panel if its limits changed, and returns whether they did.
+        """
+        frame: Final[FrameKey] = frame_key(panel)
+        if frame == self._frame:
+            return False
+        draw_frame(self._axes, panel)
+        self._frame = frame
+        return True
+
+    def update_content(self, panel: scene.Panel) -> None:
+        axes: Final["Axes"] = self._axes
+        with instrumentation.phase("renderer.update_content", axes):
+            with instrumentation.phase("renderer.lines", axes):
+                self._update_lines(panel)
+            with instrumentation.phase("renderer.markers", axes):
+                self._update_markers(panel)
+            with instrumentation.phase("renderer.axes", axes):
+                self._update_axes(panel)
+            with instrumentation.phase("renderer.labels", axes):
+                self._update_labels(panel)
+
+    def _created(self, artist: Any) -> Any:
+        artist.set_animated(self._animated)
+        return artist
+
+    def _update_lines(self, panel: scene.Panel) -> None:
+        previous: Final[dict[tuple[Any, float, str], Any]] = self._lines
+        self._lines = {}
+        for lines in panel.lines:
+            key = (lines.color, lines.width, lines.style)
+            collection = previous.pop(key, None)
+            if collection is None:
+                collection = self._created(
+                    plotting.draw_lines(
+                        self._axes, lines.lines, lines.color, lines.width, lines.style
+                    )
+                )
+            else:
+                collection.set_segments(lines.lines)
+            self._lines[key] = collection
+        for collection in previous.values():
+            collection.remove()
+
+    def _update_markers(self, panel: scene.Panel) -> None:
+        previous: Final[dict[tuple[Any, str], Any]] = self._markers
+        self._markers = {}
+        for markers in panel.markers:
+            key = (markers.color, markers.shape)
+            collection = previous.pop(key, None)
+            if collection is None:
+                collection = self._created(
+                    plotting.draw_markers(
+                        self._axes,
+                        markers.points[:, 0],
+                        markers.points[:, 1],
+                        markers.color,
+                        markers.shape,
+                    )
+                )
+            else:
+                collection.set_offsets(markers.points)
+            self._markers[key] = collection
+        for collection in previous.values():
+            collection.remove()
+
+    def _update_axes(self, panel: scene.Panel) -> None:
+        for i, axis in enumerate(panel.axes):
+            if i == len(self._axes_artists):
+                self._axes_artists.append(
+                    [
+                        self._created(artist)
+                        for artist in plotting.draw_axis(
+                            self._axes,
+                            axis.label,
+                            axis.start[0],
+                            axis.start[1],
+                            axis.offset[0],
+                            axis.offset[1],
+                            axis.color,
+                        )
+                    ]
+                )
+                continue
+            arrow, annotation = self._axes_artists[i]
+            arrow.set_data(
+                x=axis.start[0], y=axis.start[1], dx=axis.offset[0], dy=axis.offset[1]
+            )
+            arrow.set_color(axis.color)
+            annotation.set_text(axis.label)
+            annotation.xy = axis.start + axis.offset
+            annotation.set_color(axis.color)
+        for artists in self._axes_artists[len(panel.axes) :]:
+            for artist in artists:
+                artist.remove()
+        del self._axes_artists[len(panel.axes) :]
+
+    def _update_labels(self, panel: scene.Panel) -> None:
+        used: Final[dict[bool, int]] = {False: 0, True: 0}
+        for labels in panel.labels:
+            pool = self._labels[labels.arrow]
+            for text, (x, t) in zip(labels.texts, labels.positions):
+                if used[labels.arrow] == len(pool):
+                    pool.append(
+                        self._created(
+                            plotting.draw_label(
+                                self._axes,
+                                text,
+                                x,
+                                t,
+                                labels.text_offset,
+                                labels.color,
+                                labels.rotation,
+                                labels.arrow,
+                            )
+                        )
+                    )
+                else:
+                    annotation = pool[used[labels.arrow]]
+                    annotation.set_text(text)
+                    annotation.xy = (x, t)
+                    annotation.xyann = labels.text_offset
+                    annotation.set_color(labels.color)
+                    annotation.set_rotation(labels.rotation)
+                    if labels.arrow:
+                        annotation.arrow_patch.set_color(labels.color)
+                used[labels.arrow] += 1
+        for arrow, pool in self._labels.items():
+            for annotation in pool[used[arrow] :]:
+                annotation.remove()
+            del pool[used[arrow] :]
@@ -0,0 +1,157 @@
+from dataclasses import dataclass
+from functools import cached_property
+from math import atanh, isfinite
+from numbers import Integral, Real
+from typing import TYPE_CHECKING, Any, Final
+
+from src import maths
+
+if TYPE_CHECKING:
+    from src.worldline import Itinerary
+
+# Styles of the world lines: the ones that LineCollection accepts as strings.
+LINE_STYLES: Final[tuple[str, ...]] = (
+    "-",
+    "--",
+    "-.",
+    ":",
+    "solid",
+    "dashed",
+    "dashdot",
+    "dotted",
+)
+# Largest time a diagram may span, margins included [y]. Far beyond it, the limits
+# rounded to whole years no longer fit in NumPy integers.
+MAX_EXTENT: Final[float] = 1e15
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    Parameters of a twin paradox trip, and the quantities derived from them. Each
+    derived quantity is computed once, the first time it's read.
+
+    Units:
+    * distances: light-years
+    * times and ages: years
+    * speeds: no unit, fraction of the speed of light
+
+    Raises ValueError if the parameters don't make a trip that can be drawn. Colors
+    aren't checked, as that takes matplotlib.
+    """
+
+    x_planet: float = 10.0
+    traveler_speed: float = 0.5
+    age_step: int = 2
+
+    margin: float = 1.5
+    color_earth: Any = "#0088ff"
+    color_traveler_first_leg: Any = "orange"
+    color_traveler_second_leg: Any = "#aa00aa"
+    leg_width: int = 2
+    leg_style: str = "-"
+
+    def __post_init__(self) -> None:
+        for name in ("x_planet", "traveler_speed", "margin", "leg_width"):
+            value = getattr(self, name)
+            if not _is_real(value) or not isfinite(value):
+                raise ValueError(f"{name} must be a finite number")
+        if not 0 < self.traveler_speed < 1:
+            raise ValueError("traveler_speed must be between 0 and 1")
+        if self.x_planet <= 0:
+            raise ValueError("x_planet must be positive")
+        if not isinstance(self.age_step, Integral) or isinstance(self.age_step, bool):
+            raise ValueError("age_step must be an integer")
+        if self.age_step < 1:
+            raise ValueError("age_step must be at least 1")
+        if self.margin < 0:
+            raise ValueError("margin must not be negative")
+        if self.leg_width <= 0:
+            raise ValueError("leg_width must be positive")
+        if self.leg_style not in LINE_STYLES:
+            raise ValueError(f"leg_style must be one of {', '.join(LINE_STYLES)}")
+        # Also catches trips so slow that t_reunion overflows.
+        if not self.t_reunion + 2 * self.margin <= MAX_EXTENT:
+            raise ValueError(
+                f"the trip and its margins must last at most {MAX_EXTENT:g} years"
+            )
+
+    @cached_property
+    def gamma(self) -> float:
+        return maths.gamma(self.traveler_speed)
+
+    @cached_property
+    def rapidity(self) -> float:
+        return atanh(self.traveler_speed)
+
+    @cached_property
+    def boost(self) -> maths.Boost:
+        """From the Earth frame to the traveler's outbound frame."""
+        return maths.Boost(self.rapidity)
+
+    @cached_property
+    def t_planet(self) -> float:
+        """Earth time at which the traveler turns around."""
+        return self.x_planet / self.traveler_speed
+
+    @cached_property
+    def t_reunion(self) -> float:
+        """Earth time at which the twins meet again, i.e. Earth twin's end age."""
+        return 2 * self.t_planet
+
+    @cached_property
+    def traveler_age_on_planet(self) -> float:
+        """Traveler's proper time at turnaround."""
+        _, age = maths.lorentz_transform_reference_to_prime(
+            self.x_planet, self.t_planet, self.traveler_speed
+        )
+        return age
+
+    @cached_property
+    def traveler_end_age(self) -> float:
+        """Traveler's proper time at reunion."""
+        return 2.0 * self.traveler_age_on_planet
+
+    @cached_property
+    def itinerary(self) -> "Itinerary":
+        """The trip as a world line of two legs. Imports NumPy, unlike the rest."""
+        from src.worldline import Itinerary
+
+        return Itinerary(
+            [self.traveler_speed, -self.traveler_speed],
+            [self.traveler_age_on_planet, self.traveler_age_on_planet],
+        )
+
+    @cached_property
+    def t_end_first_leg_on_earth(self) -> float:
+        """Earth time simultaneous with the turnaround, in the outbound frame."""
+        x, t = maths.lorentz_transform_prime_to_reference(
+            0, self.traveler_age_on_planet, self.traveler_speed
+        )
+        return t - x * self.traveler_speed
+
+    @cached_property
+    def t_begin_second_leg_on_earth(self) -> float:
+        """Earth time simultaneous with the turnaround, in the inbound frame."""
+        return self.t_planet + self.x_planet * self.traveler_speed
+
+    @cached_property
+    def d_earth_from_planet(self) -> float:
+        """Distance between Earth and the planet, in the traveler's frames."""
+        x, _ = maths.lorentz_transform_reference_to_prime(
+            0, self.t_end_first_leg_on_earth, self.traveler_speed
+        )
+        return -x
+
+    @cached_property
+    def earth_speed_from_traveler(self) -> float:
+        return self.d_earth_from_planet / self.traveler_age_on_planet
+
+    @cached_property
+    def earth_first_part_duration(self) -> float:
+        """Traveler's proper time for Earth to get from x'=0 to the turnaround."""
+        return self.d_earth_from_planet / self.traveler_speed
+
+
+def _is_real(value: Any) -> bool:
+    return isinstance(value, Real) and not isinstance(value, bool)
@@ -0,0 +1,296 @@
+from dataclasses import dataclass
+from typing import Any, Final
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+
+@dataclass(frozen=True)
+class Lines:
+    """
+    Lines sharing a style. Each line is an (n, 2) array of (x, t) vertices, and has the
+    matching kind in kinds, see PanelBuilder.
+    """
+
+    lines: tuple[NDArray[np.float64], ...]
+    color: Any
+    width: float
+    style: str
+    kinds: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class Markers:
+    """
+    Markers sharing a shape and a color, as an (n, 2) array of (x, t) events, each with
+    the matching kind in kinds.
+    """
+
+    points: NDArray[np.float64]
+    color: Any
+    shape: str
+    kinds: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class Axis:
+    """
+    Axis of a frame, drawn as an arrow going from start to start + offset.
+    """
+
+    label: str
+    start: NDArray[np.float64]
+    offset: NDArray[np.float64]
+    color: Any
+
+
+@dataclass(frozen=True)
+class Labels:
+    """
+    Texts sharing a style. Each text is placed at the matching (x, t) position, moved by
+    text_offset (in font sizes). If arrow is set, an arrow points from the text to the
+    position.
+    """
+
+    texts: tuple[str, ...]
+    positions: NDArray[np.float64]
+    text_offset: tuple[float, float]
+    color: Any
+    rotation: float
+    arrow: bool
+    kinds: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class Panel:
+    title: str
+    x_min: float
+    x_max: float
+    t_max: float
+    margin: float
+    x_name: str
+    t_name: str
+    lines: tuple[Lines, ...]
+    markers: tuple[Markers, ...]
+    axes: tuple[Axis, ...]
+    labels: tuple[Labels, ...]
+
+
+@dataclass(frozen=True)
+class Scene:
+    earth_frame: Panel
+    traveler_frame: Panel
+    traveler_end_age: float
+    d_earth_from_planet: float
+
+
+class PanelBuilder:
+    """
+    Collects the geometry of a panel and groups it by style, see build().
+
+    Each line, marker and text can be tagged with the kind of event it shows, e.g.
+    "world_line" or "age_mark", which doesn't change how it's drawn, see export.
+    """
+
+    def __init__(
+        self,
+        title: str,
+        x_min: float,
+        x_max: float,
+        t_max: float,
+        margin: float,
+        x_name: str = "x",
+        t_name: str = "t",
+    ) -> None:
+        self._title: Final[str] = title
+        self._x_min: Final[float] = x_min
+        self._x_max: Final[float] = x_max
+        self._t_max: Final[float] = t_max
+        self._margin: Final[float] = margin
+        self._x_name: Final[str] = x_name
+        self._t_name: Final[str] = t_name
+        self._lines: dict[
+            tuple[Any, float, str], tuple[list[NDArray[np.float64]], list[str]]
+        ] = {}
+        self._markers: dict[
+            tuple[Any, str], tuple[list[tuple[float, float]], list[str]]
+        ] = {}
+        self._axes: list[Axis] = []
+        self._labels: dict[
+            tuple[Any, tuple[float, float], float, bool],
+            tuple[list[str], list[tuple[float, float]], list[str]],
+        ] = {}
+
+    def add_line(
+        self,
+        data_x: ArrayLike,
+        data_t: ArrayLike,
+        color: Any,
+        width: float,
+        style: str,
+        kind: str = "",
+    ) -> None:
+        lines, kinds = self._lines.setdefault((color, width, style), ([], []))
+        lines.append(frozen(np.column_stack((data_x, data_t))))
+        kinds.append(kind)
+
+    def add_marker(
+        self,
+        x: float,
+        t: float,
+        color: Any,
+        label: str | None = None,
+        margin: float = 0.0,
+        shape: str = "s",  # square
+        kind: str = "",
+    ) -> None:
+        points, kinds = self._markers.setdefault((color, shape), ([], []))
+        points.append((x, t))
+        kinds.append(kind)
+        if label is not None:
+            self.annotate(label, x, t + margin, (-4, 5.2), color, arrow=True, kind=kind)
+
+    def add_axis(
+        self,
+        label: str,
+        x_start: float,
+        t_start: float,
+        x_offset: float,
+        t_offset: float,
+        color: Any,
+    ) -> None:
+        self._axes.append(
+            Axis(
+                label,
+                frozen(np.array([x_start, t_start], dtype=np.float64)),
+                frozen(np.array([x_offset, t_offset], dtype=np.float64)),
+                color,
+            )
+        )
+
+    def annotate(
+        self,
+        text: str,
+        x: float,
+        t: float,
+        text_offset: tuple[float, float],
+        color: Any,
+        rotation: float = 0.0,
+        arrow: bool = False,
+        kind: str = "",
+    ) -> None:
+        texts, positions, kinds = self._labels.setdefault(
+            (color, text_offset, rotation, arrow), ([], [], [])
+        )
+        texts.append(text)
+        positions.append((x, t))
+        kinds.append(kind)
+
+    def build(self) -> Panel:
+        return Panel(
+            self._title,
+            self._x_min,
+            self._x_max,
+            self._t_max,
+            self._margin,
+            self._x_name,
+            self._t_name,
+            tuple(
+                Lines(tuple(lines), color, width, style, tuple(kinds))
+                for (color, width, style), (lines, kinds) in self._lines.items()
+            ),
+            tuple(
+                Markers(
+                    frozen(np.array(points, dtype=np.float64)),
+                    color,
+                    shape,
+                    tuple(kinds),
+                )
+                for (color, shape), (points, kinds) in self._markers.items()
+            ),
+            tuple(self._axes),
+            tuple(
+                Labels(
+                    tuple(texts),
+                    frozen(np.array(positions, dtype=np.float64)),
+                    text_offset,
+                    color,
+                    rotation,
+                    arrow,
+                    tuple(kinds),
+                )
+                for (color, text_offset, rotation, arrow), (
+                    texts,
+                    positions,
+                    kinds,
+                ) in self._labels.items()
+            ),
+        )
+
+
+def frozen(array: NDArray[np.float64]) -> NDArray[np.float64]:
+    """Makes the array read-only and returns it, for arrays shared between scenes."""
+    array.flags.writeable = False
+    return array
+
+
+def to_arrays(diagram: Scene) -> tuple[dict[str, Any], NDArray[np.float64]]:
+    """
+    Flattens a scene into JSON-compatible metadata and a single float64 array holding
+    the coordinates of all its arrays, see from_arrays().
+    """
+    chunks: Final[list[NDArray[np.float64]]] = []
+    metadata: Final[dict[str, Any]] = _encode(diagram, chunks, [0])
+    data: Final[NDArray[np.float64]] = (
+        np.concatenate(chunks) if chunks else np.empty(0, dtype=np.float64)
+    )
+    return metadata, data
+
+
+def from_arrays(metadata: dict[str, Any], data: NDArray[np.float64]) -> Scene:
+    """
+    Rebuilds a scene flattened by to_arrays(). The arrays of the scene are views of
+    data, so data can be memory-mapped to load a scene without copying it.
+    """
+    return _decode(metadata, data)
+
+
+_TYPES: Final[dict[str, Any]] = {
+    cls.__name__: cls for cls in (Lines, Markers, Axis, Labels, Panel, Scene)
+}
+
+
+def _encode(value: Any, chunks: list[NDArray[np.float64]], size: list[int]) -> Any:
+    if type(value).__name__ in _TYPES:
+        return {
+            "type": type(value).__name__,
+            "fields": {
+                field: _encode(getattr(value, field), chunks, size)
+                for field in value.__dataclass_fields__
+            },
+        }
+    if isinstance(value, np.ndarray):
+        chunks.append(value.astype(np.float64).ravel())
+        start: Final[int] = size[0]
+        size[0] += value.size
+        return {"array": [start, list(value.shape)]}
+    if isinstance(value, tuple):
+        return {"tuple": [_encode(item, chunks, size) for item in value]}
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _decode(value: Any, data: NDArray[np.float64]) -> Any:
+    if not isinstance(value, dict):
+        return value
+    if "type" in value:
+        return _TYPES[value["type"]](
+            **{name: _decode(field, data) for name, field in value["fields"].items()}
+        )
+    if "array" in value:
+        start, shape = value["array"]
+        array = data[start : start + int(np.prod(shape))].reshape(shape)
+        array.flags.writeable = False
+        return array
+    return tuple(_decode(item, data) for item in value["tuple"])
@@ -0,0 +1,146 @@
+from dataclasses import dataclass, replace
+from typing import Any, Final
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src import scene
+from src.worldline import Itinerary
+
+
+@dataclass(frozen=True)
+class Signals:
+    """
+    Light signals sent by one twin to the other, one element per signal: emission and
+    reception events in the Earth frame, with the proper times of the emitter and of the
+    receiver. doppler is the received frequency over the emitted frequency.
+    """
+
+    emission_ages: NDArray[np.float64]
+    emission_x: NDArray[np.float64]
+    emission_t: NDArray[np.float64]
+    reception_ages: NDArray[np.float64]
+    reception_x: NDArray[np.float64]
+    reception_t: NDArray[np.float64]
+    doppler: NDArray[np.float64]
+
+    @property
+    def lines(self) -> NDArray[np.float64]:
+        """(signals, 2, 2) array of the (x, t) ends of each signal."""
+        return np.stack(
+            (
+                np.column_stack((self.emission_x, self.emission_t)),
+                np.column_stack((self.reception_x, self.reception_t)),
+            ),
+            axis=1,
+        )
+
+
+def from_earth(itinerary: Itinerary, interval: float) -> Signals:
+    """
+    Signals sent by Earth every interval of its time, received by the traveler before
+    the end of the itinerary (until the reunion for a round trip).
+    """
+    ages, x, t = _vertices(itinerary)
+    # A signal sent by Earth at t_e reaches the traveler where t - |x| = t_e. t - |x|
+    # grows along the world line, and linearly between vertices, so the reception is
+    # found by binary search among the vertices, for all the signals at once.
+    emission_times: Final[NDArray[np.float64]] = t - np.abs(x)
+    emission_t: Final[NDArray[np.float64]] = np.arange(
+        0.0, emission_times[-1], interval
+    )
+    reception_ages: Final[NDArray[np.float64]] = np.interp(
+        emission_t, emission_times, ages
+    )
+    legs: Final[NDArray[np.intp]] = itinerary.legs(reception_ages)
+    reception_x, reception_t = itinerary.events(reception_ages, legs)
+    return Signals(
+        emission_t,
+        np.zeros_like(emission_t),
+        emission_t,
+        reception_ages,
+        reception_x,
+        reception_t,
+        # Rate of t - |x| over the traveler's proper time.
+        itinerary.gammas[legs]
+        * (1 - itinerary.velocities[legs] * _sides(reception_x, legs, itinerary)),
+    )
+
+
+def from_traveler(itinerary: Itinerary, interval: float) -> Signals:
+    """
+    Signals sent by the traveler every interval of their proper time until the reunion,
+    received by Earth.
+    """
+    emission_ages: Final[NDArray[np.float64]] = np.arange(
+        0.0, itinerary.end_age, interval
+    )
+    legs: Final[NDArray[np.intp]] = itinerary.legs(emission_ages)
+    emission_x, emission_t = itinerary.events(emission_ages, legs)
+    # Light takes |x| years to get back to Earth.
+    reception_t: Final[NDArray[np.float64]] = emission_t + np.abs(emission_x)
+    return Signals(
+        emission_ages,
+        emission_x,
+        emission_t,
+        reception_t,
+        np.zeros_like(reception_t),
+        reception_t,
+        # Inverse of the rate of t + |x| over the traveler's proper time.
+        1
+        / (
+            itinerary.gammas[legs]
+            * (1 + itinerary.velocities[legs] * _sides(emission_x, legs, itinerary))
+        ),
+    )
+
+
+def overlay(
+    panel: scene.Panel,
+    signals: Signals,
+    color: Any,
+    width: float = 0.5,
+    style: str = "-",
+) -> scene.Panel:
+    """
+    The panel with the signals added, as a single group of lines of kind "signal".
+    """
+    lines: Final[NDArray[np.float64]] = signals.lines
+    lines.flags.writeable = False
+    return replace(
+        panel,
+        lines=panel.lines
+        + (
+            scene.Lines(
+                tuple(lines), color, width, style, ("signal",) * len(signals.doppler)
+            ),
+        ),
+    )
+
+
+def _vertices(
+    itinerary: Itinerary,
+) -> tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]:
+    """
+    Ages and (x, t) of the vertices of the world line, plus the events where the
+    traveler crosses Earth's position, so that |x| is linear between vertices.
+    """
+    ages: Final[NDArray[np.float64]] = itinerary.start_ages
+    x: Final[NDArray[np.float64]] = itinerary.start_positions
+    crossing: Final[NDArray[np.bool_]] = x[:-1] * x[1:] < 0
+    crossing_ages: Final[NDArray[np.float64]] = ages[:-1][crossing] - x[:-1][
+        crossing
+    ] / (itinerary.gammas[crossing] * itinerary.velocities[crossing])
+    all_ages: Final[NDArray[np.float64]] = np.sort(
+        np.concatenate((ages, crossing_ages))
+    )
+    # The world line is continuous, so the leg picked at a vertex doesn't matter.
+    all_x, all_t = itinerary.events(all_ages)
+    return all_ages, all_x, all_t
+
+
+def _sides(x: NDArray[np.float64], legs: NDArray[np.intp], itinerary: Itinerary) -> Any:
+    """
+    Side of Earth the traveler is on: 1 or -1. At Earth, the side the leg goes to.
+    """
+    return np.where(x == 0, np.sign(itinerary.velocities[legs]), np.sign(x))
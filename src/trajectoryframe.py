@@ -0,0 +1,120 @@
+from math import ceil
+from typing import Any, Final
+
+import numpy as np
+
+from src import instrumentation
+from src import plotting
+from src import scene
+from src.scenario import Scenario
+from src.worldline import Trajectory
+
+
+def build(
+    scenario: Scenario,
+    trajectory: Trajectory,
+    x_min: float,
+    x_max: float,
+    t_max: float,
+) -> scene.Panel:
+    """
+    Earth frame view of a trajectory with continuous acceleration. Colors, margin and
+    age step come from the scenario.
+    """
+    panel: Final[scene.PanelBuilder] = scene.PanelBuilder(
+        "Earth frame, accelerating traveler",
+        x_min,
+        x_max,
+        t_max,
+        scenario.margin,
+        "x",
+        "t",
+    )
+
+    with instrumentation.phase("trajectoryframe.earth_explanation"):
+        _draw_earth_explanation(panel, scenario, trajectory, x_max, t_max)
+    with instrumentation.phase("trajectoryframe.traveler_explanation"):
+        _draw_traveler_explanation(panel, scenario, trajectory)
+
+    return panel.build()
+
+
+def _draw_earth_explanation(
+    panel: scene.PanelBuilder,
+    scenario: Scenario,
+    trajectory: Trajectory,
+    x_max: float,
+    t_max: float,
+) -> None:
+    color: Final[Any] = scenario.color_earth
+    panel.add_line(
+        [0, 0],
+        [0, trajectory.start_times[-1]],
+        color,
+        scenario.leg_width,
+        scenario.leg_style,
+        kind="world_line",
+    )
+    panel.add_axis("x", 0, 0, x_max, 0, plotting.darken(color))
+    panel.add_axis("t", 0, 0, 0, t_max, plotting.darken(color))
+
+    max_speed: Final[float] = float(np.tanh(np.abs(trajectory.start_rapidities).max()))
+    panel.annotate(
+        f"d={round(float(trajectory.start_positions.max()), 1)} ly; "
+        f"v max={round(max_speed, 2)}",
+        scenario.x_planet,
+        0,
+        (0, 0.5),
+        plotting.darken(color),
+        kind="explanation",
+    )
+
+
+def _draw_traveler_explanation(
+    panel: scene.PanelBuilder,
+    scenario: Scenario,
+    trajectory: Trajectory,
+) -> None:
+    # Adaptive sampling: dense only where the world line bends.
+    x, t = trajectory.events(trajectory.sample())
+    outbound: Final[Any] = np.diff(x) >= 0
+    # Vertices where the traveler turns around, splitting the world line in parts
+    # going away from Earth and parts coming back.
+    turns: Final[Any] = np.concatenate(
+        ([0], np.flatnonzero(np.diff(outbound)) + 1, [len(outbound)])
+    )
+    for start, end in zip(turns[:-1], turns[1:]):
+        panel.add_line(
+            x[start : end + 1],
+            t[start : end + 1],
+            _color(scenario, outbound[start]),
+            scenario.leg_width,
+            scenario.leg_style,
+            kind="world_line",
+        )
+
+    ages: Final[Any] = plotting.marks(
+        scenario.age_step, ceil(trajectory.end_age), scenario.age_step
+    )
+    age_x, age_t = trajectory.events(ages)
+    earth_t: Final[Any] = trajectory.earth_times(ages)
+    rapidities: Final[Any] = trajectory.rapidities(ages)
+    for age, x_age, t_age, t_on_earth, rapidity in zip(
+        ages, age_x, age_t, earth_t, rapidities
+    ):
+        color = plotting.darken(_color(scenario, rapidity >= 0))
+        # Simultaneity line of the traveler's instantaneous rest frame.
+        panel.add_line(
+            [x_age, 0], [t_age, t_on_earth], color, 1, ":", kind="simultaneity"
+        )
+        panel.annotate(
+            str(round(age, 1)), x_age, t_age, (0.6, -0.4), color, kind="age_mark"
+        )
+
+
+def _color(scenario: Scenario, outbound: bool) -> Any:
+    return (
+        scenario.color_traveler_first_leg
+        if outbound
+        else scenario.color_traveler_second_leg
+    )
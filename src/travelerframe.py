@@ -1,114 +1,82 @@
-from math import asin, ceil, cos, floor
+from math import ceil, floor
 from typing import Any, Final
 
-from matplotlib.axes import Axes  # type: ignore
-
 import numpy as np
 
-from src import maths
+from src import instrumentation
 from src import plotting
+from src import scene
+from src.scenario import Scenario
+
+# Earth's ages before and after the turnaround share the marks of the panel.
+_MAX_MARKS: Final[int] = plotting.MAX_MARKS // 2
 
 
-def draw(
-    axes: Axes,
+def build(
+    scenario: Scenario,
     x_min: float,
     x_max: float,
     t_max: float,
-    traveler_end_age: float,
-    t_reunion: float,
-    x_planet: float,
-    traveler_speed: float,
-    d_earth_from_planet: float,
-    age_step: int,
-    margin: float,
-    color_traveler_first_leg: Any,
-    color_traveler_second_leg: Any,
-    color_earth: Any,
-    leg_width: int,
-    leg_style: str,
-) -> None:
-    plotting.draw_axes(
-        axes, "Traveler's frames", x_min, x_max, t_max, margin, "x'/x''", "t'/t''"
-    )
-
-    _draw_traveler_explanation(
-        axes,
+) -> scene.Panel:
+    panel: Final[scene.PanelBuilder] = scene.PanelBuilder(
+        "Traveler's frames",
         x_min,
         x_max,
         t_max,
-        traveler_end_age,
-        color_traveler_first_leg,
-        color_traveler_second_leg,
-        leg_width,
-        leg_style,
+        scenario.margin,
+        "x'/x''",
+        "t'/t''",
     )
 
-    _draw_earth_first_part_explanation(
-        axes,
-        margin,
-        traveler_speed,
-        d_earth_from_planet,
-        age_step,
-        color_earth,
-        leg_width,
-        leg_style,
-    )
+    with instrumentation.phase("travelerframe.traveler_explanation"):
+        _draw_traveler_explanation(panel, scenario, x_min, x_max, t_max)
+    with instrumentation.phase("travelerframe.earth_first_part_explanation"):
+        _draw_earth_first_part_explanation(panel, scenario)
+    with instrumentation.phase("travelerframe.earth_second_part_explanation"):
+        _draw_earth_second_part_explanation(panel, scenario)
 
-    _draw_earth_second_part_explanation(
-        axes,
-        margin,
-        traveler_speed,
-        d_earth_from_planet,
-        t_reunion,
-        x_planet,
-        age_step,
-        color_earth,
-        leg_width,
-        leg_style,
-    )
+    return panel.build()
 
 
 def _draw_traveler_explanation(
-    axes: Axes,
+    panel: scene.PanelBuilder,
+    scenario: Scenario,
     x_min: float,
     x_max: float,
     t_max: float,
-    traveler_end_age: float,
-    color_traveler_first_leg: Any,
-    color_traveler_second_leg: Any,
-    leg_width: int,
-    leg_style: str,
 ) -> None:
-    first_leg_x: Final[Any] = np.linspace(0, 0)
-    first_leg_t: Final[Any] = np.linspace(0, traveler_end_age / 2.0)
-    plotting.draw_line(
-        axes,
+    traveler_end_age: Final[float] = scenario.traveler_end_age
+    color_traveler_first_leg: Final[Any] = scenario.color_traveler_first_leg
+    color_traveler_second_leg: Final[Any] = scenario.color_traveler_second_leg
+    first_leg_x: Final[Any] = np.array([0, 0])
+    first_leg_t: Final[Any] = np.array([0, traveler_end_age / 2.0])
+    panel.add_line(
         first_leg_x,
         first_leg_t,
         color_traveler_first_leg,
-        leg_width,
-        leg_style,
+        scenario.leg_width,
+        scenario.leg_style,
+        kind="world_line",
     )
-    plotting.draw_marker(
-        axes,
+    panel.add_marker(
         0,
         traveler_end_age / 2.0,
         plotting.darken(color_traveler_first_leg),
+        kind="turnaround",
     )
 
-    second_leg_x: Final[Any] = np.linspace(0, 0)
-    second_leg_t: Final[Any] = np.linspace(traveler_end_age / 2.0, traveler_end_age)
-    plotting.draw_line(
-        axes,
+    second_leg_x: Final[Any] = np.array([0, 0])
+    second_leg_t: Final[Any] = np.array([traveler_end_age / 2.0, traveler_end_age])
+    panel.add_line(
         second_leg_x,
         second_leg_t,
         color_traveler_second_leg,
-        leg_width,
-        leg_style,
+        scenario.leg_width,
+        scenario.leg_style,
+        kind="world_line",
     )
 
-    plotting.draw_axis(
-        axes,
+    panel.add_axis(
         "x'",
         x_min,
         0,
@@ -116,8 +84,7 @@ def _draw_traveler_explanation(
         0,
         plotting.darken(color_traveler_first_leg),
     )
-    plotting.draw_axis(
-        axes,
+    panel.add_axis(
         "x''",
         x_min,
         traveler_end_age / 2.0,
@@ -125,8 +92,7 @@ def _draw_traveler_explanation(
         0,
         plotting.darken(color_traveler_second_leg),
     )
-    plotting.draw_axis(
-        axes,
+    panel.add_axis(
         "t'/t''",
         0,
         0,
@@ -137,100 +103,86 @@ def _draw_traveler_explanation(
 
 
 def _draw_earth_first_part_explanation(
-    axes: Axes,
-    margin: float,
-    traveler_speed: float,
-    d_earth_from_planet: float,
-    age_step: int,
-    color_earth: Any,
-    leg_width: int,
-    leg_style: str,
+    panel: scene.PanelBuilder,
+    scenario: Scenario,
 ) -> None:
-    earth_x_first_part: Final[Any] = np.linspace(0, -d_earth_from_planet)
+    traveler_speed: Final[float] = scenario.traveler_speed
+    d_earth_from_planet: Final[float] = scenario.d_earth_from_planet
+    age_step: Final[int] = scenario.age_step
+    color_earth: Final[Any] = scenario.color_earth
+    earth_x_first_part: Final[Any] = np.array([0, -d_earth_from_planet])
     earth_t_first_part: Final[Any] = -earth_x_first_part / traveler_speed
-    plotting.draw_line(
-        axes,
+    panel.add_line(
         earth_x_first_part,
         earth_t_first_part,
         color_earth,
-        leg_width,
-        leg_style,
+        scenario.leg_width,
+        scenario.leg_style,
+        kind="world_line",
     )
 
-    plotting.draw_marker(
-        axes,
+    panel.add_marker(
         -d_earth_from_planet,
-        d_earth_from_planet / traveler_speed,
+        scenario.earth_first_part_duration,
         plotting.darken(color_earth),
+        kind="turnaround",
     )
 
-    plotting.draw_axis(
-        axes,
+    panel.add_axis(
         "t",
         0,
         0,
         -d_earth_from_planet * 1.2,
-        d_earth_from_planet / traveler_speed * 1.2,
+        scenario.earth_first_part_duration * 1.2,
         plotting.darken(color_earth),
     )
 
-    _, end_age_on_earth = maths.lorentz_transform_prime_to_reference(
-        -d_earth_from_planet,
-        d_earth_from_planet / traveler_speed,
-        traveler_speed,
+    ages: Final[Any] = plotting.marks(
+        age_step, floor(scenario.t_end_first_leg_on_earth), age_step, _MAX_MARKS
     )
-
-    for age in range(age_step, floor(end_age_on_earth), age_step):
-        x1_age_mark, t1_age_mark = maths.lorentz_transform_reference_to_prime(
-            0,
-            age,
-            traveler_speed,
-        )
-        plotting.draw_marker(
-            axes,
+    x1_age_marks, t1_age_marks = scenario.boost.apply_array(0, ages)
+    for age, x1_age_mark, t1_age_mark in zip(ages, x1_age_marks, t1_age_marks):
+        panel.add_marker(
             x1_age_mark,
             t1_age_mark,
             plotting.darken(color_earth),
-            margin=margin,
+            margin=scenario.margin,
             shape="_",
+            kind="age_mark",
         )
-        axes.annotate(
+        panel.annotate(
             str(age),
-            xy=(x1_age_mark, t1_age_mark),
-            textcoords="offset fontsize",
-            xytext=(0.8, -0.3),
-            color=plotting.darken(color_earth),
+            x1_age_mark,
+            t1_age_mark,
+            (0.8, -0.3),
+            plotting.darken(color_earth),
+            kind="age_mark",
         )
 
 
 def _draw_earth_second_part_explanation(
-    axes: Axes,
-    margin: float,
-    traveler_speed: float,
-    d_earth_from_planet: float,
-    t_reunion: float,
-    x_planet: float,
-    age_step: int,
-    color_earth: Any,
-    leg_width: int,
-    leg_style: str,
+    panel: scene.PanelBuilder,
+    scenario: Scenario,
 ) -> None:
-    first_leg_duration = d_earth_from_planet / traveler_speed
-    earth_x_second_part: Final[Any] = np.linspace(-d_earth_from_planet, 0)
-    earth_t_second_part: Final[Any] = np.linspace(
-        first_leg_duration, 2.0 * first_leg_duration
-    )
-    plotting.draw_line(
-        axes,
+    d_earth_from_planet: Final[float] = scenario.d_earth_from_planet
+    t_reunion: Final[float] = scenario.t_reunion
+    age_step: Final[int] = scenario.age_step
+    color_earth: Final[Any] = scenario.color_earth
+    first_leg_duration: Final[float] = scenario.earth_first_part_duration
+    earth_x_second_part: Final[Any] = np.array([-d_earth_from_planet, 0])
+    earth_t_second_part: Final[Any] = np.array(
+        [first_leg_duration, 2.0 * first_leg_duration]
+    )
+    panel.add_line(
         earth_x_second_part,
         earth_t_second_part,
         color_earth,
-        leg_width,
-        leg_style,
+        scenario.leg_width,
+        scenario.leg_style,
+        kind="world_line",
     )
 
-    plotting.draw_axis(
-        axes,
+    panel.add_axis(
         "t",
         -d_earth_from_planet,
         first_leg_duration,
@@ -239,29 +191,33 @@ def _draw_earth_second_part_explanation(
         plotting.darken(color_earth),
     )
 
-    t_begin_second_part = t_reunion / 2.0 + x_planet * traveler_speed
-    for age in range(
-        ceil(t_begin_second_part / age_step) * age_step, floor(t_reunion), age_step
-    ):
-        x2_age_mark, t2_age_mark = maths.lorentz_transform_reference_to_prime(
-            0,
-            age - t_begin_second_part,
-            traveler_speed,
-        )
-        x2_age_mark = -d_earth_from_planet - x2_age_mark
-        t2_age_mark += first_leg_duration
-        plotting.draw_marker(
-            axes,
+    t_begin_second_part: Final[float] = scenario.t_begin_second_leg_on_earth
+    ages: Final[Any] = plotting.marks(
+        ceil(t_begin_second_part / age_step) * age_step,
+        floor(t_reunion),
+        age_step,
+        _MAX_MARKS,
+    )
+    # The inbound frame, with its origin moved to where Earth is at the turnaround.
+    x2_age_marks, t2_age_marks = scenario.boost.inverse().apply_array(
+        0, ages - t_begin_second_part
+    )
+    x2_age_marks -= d_earth_from_planet
+    t2_age_marks += first_leg_duration
+    for age, x2_age_mark, t2_age_mark in zip(ages, x2_age_marks, t2_age_marks):
+        panel.add_marker(
             x2_age_mark,
             t2_age_mark,
             plotting.darken(color_earth),
-            margin=margin,
+            margin=scenario.margin,
             shape="_",
+            kind="age_mark",
         )
-        axes.annotate(
+        panel.annotate(
             str(age),
-            xy=(x2_age_mark, t2_age_mark),
-            textcoords="offset fontsize",
-            xytext=(-1.4, 0.3),
-            color=plotting.darken(color_earth),
+            x2_age_mark,
+            t2_age_mark,
+            (-1.4, 0.3),
+            plotting.darken(color_earth),
+            kind="age_mark",
         )
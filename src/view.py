@@ -0,0 +1,131 @@
+from dataclasses import replace
+from math import ceil, floor
+from typing import Final, Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src import maths
+from src import scene
+
+
+def observe(
+    panel: scene.Panel,
+    boost: maths.Boost,
+    title: str | None = None,
+    x_name: str = "x'",
+    t_name: str = "t'",
+) -> scene.Panel:
+    """
+    The panel as seen from the frame the boost goes to. See observe_all().
+    """
+    return observe_all(panel, [boost], [title], x_name, t_name)[0]
+
+
+def observe_all(
+    panel: scene.Panel,
+    boosts: Sequence[maths.Boost],
+    titles: Sequence[str | None] | None = None,
+    x_name: str = "x'",
+    t_name: str = "t'",
+) -> list[scene.Panel]:
+    """
+    The panel as seen from the frame each boost goes to. All the coordinates of the
+    panel (lines, markers, axes and labels) are gathered in a single array, and
+    transformed for all the boosts at once. The limits of each new panel fit all its
+    points: lines, markers, ends of the axes and positions of the labels. A title of
+    None means "Frame at v=...". No boosts give no panels.
+
+    Texts keep their rotation and markers their shape, even if what they follow got
+    tilted by the boost.
+    """
+    if not boosts:
+        return []
+    if titles is None:
+        titles = [None] * len(boosts)
+
+    # Points of the panel, in the order split back by _rebuild().
+    chunks: Final[list[NDArray[np.float64]]] = [
+        *(line for lines in panel.lines for line in lines.lines),
+        *(markers.points for markers in panel.markers),
+        *(np.stack((axis.start, axis.offset)) for axis in panel.axes),
+        *(labels.positions for labels in panel.labels),
+    ]
+    points: Final[NDArray[np.float64]] = (
+        np.concatenate(chunks) if chunks else np.empty((0, 2))
+    )
+    matrices: Final[NDArray[np.float64]] = np.stack(
+        [boost.matrix() for boost in boosts]
+    )
+    # (boosts, points, 2): each (x, t) row times the transposed matrix of each boost.
+    boosted: Final[NDArray[np.float64]] = np.einsum("pj,bij->bpi", points, matrices)
+    ends: Final[NDArray[np.intp]] = np.cumsum([len(chunk) for chunk in chunks])[:-1]
+
+    return [
+        _rebuild(
+            panel,
+            np.split(boosted_points, ends),
+            title if title is not None else f"Frame at v={round(boost.velocity, 3)}",
+            x_name,
+            t_name,
+        )
+        for boost, title, boosted_points in zip(boosts, titles, boosted)
+    ]
+
+
+def _rebuild(
+    panel: scene.Panel,
+    chunks: list[NDArray[np.float64]],
+    title: str,
+    x_name: str,
+    t_name: str,
+) -> scene.Panel:
+    remaining: Final[list[NDArray[np.float64]]] = chunks[::-1]
+
+    def take() -> NDArray[np.float64]:
+        chunk: Final[NDArray[np.float64]] = remaining.pop()
+        chunk.flags.writeable = False
+        return chunk
+
+    lines: Final[tuple[scene.Lines, ...]] = tuple(
+        replace(lines, lines=tuple(take() for _ in lines.lines))
+        for lines in panel.lines
+    )
+    markers: Final[tuple[scene.Markers, ...]] = tuple(
+        replace(markers, points=take()) for markers in panel.markers
+    )
+    axes: Final[list[scene.Axis]] = []
+    for axis in panel.axes:
+        start, offset = take()
+        axes.append(replace(axis, start=start, offset=offset))
+    labels: Final[tuple[scene.Labels, ...]] = tuple(
+        replace(labels, positions=take()) for labels in panel.labels
+    )
+
+    points: Final[NDArray[np.float64]] = np.concatenate(
+        [
+            np.empty((0, 2)),
+            *(line for group in lines for line in group.lines),
+            *(group.points for group in markers),
+            *(np.stack((axis.start, axis.start + axis.offset)) for axis in axes),
+            *(group.positions for group in labels),
+        ]
+    )
+    if len(points):
+        x_min, _ = points.min(axis=0)
+        x_max, t_max = points.max(axis=0)
+    else:
+        x_min, x_max, t_max = panel.x_min, panel.x_max, panel.t_max
+    return replace(
+        panel,
+        title=title,
+        x_min=float(floor(x_min)),
+        x_max=float(ceil(x_max)),
+        t_max=float(ceil(t_max)),
+        x_name=x_name,
+        t_name=t_name,
+        lines=lines,
+        markers=markers,
+        axes=tuple(axes),
+        labels=labels,
+    )
@@ -0,0 +1,340 @@
+from typing import Callable, Final
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from src.scene import frozen
+
+
+class Itinerary:
+    """
+    Piecewise-inertial world line of a traveler leaving Earth at event (0, 0): a leg per
+    velocity (signed fraction of the speed of light, positive going away from Earth)
+    with its duration in the traveler's proper time. Everything is computed for all legs
+    at once, with cumulative sums, so itineraries can have many legs.
+
+    Units:
+    * distances: light-years
+    * times and ages: years
+    """
+
+    def __init__(self, velocities: ArrayLike, durations: ArrayLike) -> None:
+        self.velocities: Final[NDArray[np.float64]] = frozen(
+            np.asarray(velocities, dtype=np.float64)
+        )
+        self.durations: Final[NDArray[np.float64]] = frozen(
+            np.asarray(durations, dtype=np.float64)
+        )
+        if self.velocities.shape != self.durations.shape or self.velocities.ndim != 1:
+            raise ValueError("velocities and durations must be 1D and of same length")
+        if len(self.velocities) == 0:
+            raise ValueError("itinerary must have at least one leg")
+        if np.any(np.abs(self.velocities) >= 1):
+            raise ValueError("velocities must be slower than light")
+        if np.any(self.durations < 0):
+            raise ValueError("durations must not be negative")
+
+        self.gammas: Final[NDArray[np.float64]] = frozen(
+            1 / np.sqrt(1 - self.velocities**2)
+        )
+        # Traveler's ages and Earth frame events at the start of each leg, and at the end
+        # of the last one.
+        self.start_ages: Final[NDArray[np.float64]] = frozen(
+            _cumsum_from_zero(self.durations)
+        )
+        earth_durations: Final[NDArray[np.float64]] = self.gammas * self.durations
+        self.start_times: Final[NDArray[np.float64]] = frozen(
+            _cumsum_from_zero(earth_durations)
+        )
+        self.start_positions: Final[NDArray[np.float64]] = frozen(
+            _cumsum_from_zero(self.velocities * earth_durations)
+        )
+        # Index of the Earth times simultaneous with the start and the end of each leg,
+        # in the traveler's frame during the leg. In between, the Earth time grows as
+        # the traveler's age divided by gamma.
+        self.leg_start_earth_times: Final[NDArray[np.float64]] = frozen(
+            self.start_times[:-1] - self.velocities * self.start_positions[:-1]
+        )
+        self.leg_end_earth_times: Final[NDArray[np.float64]] = frozen(
+            self.leg_start_earth_times + self.durations / self.gammas
+        )
+
+    @property
+    def end_age(self) -> float:
+        return float(self.start_ages[-1])
+
+    @property
+    def vertices(self) -> NDArray[np.float64]:
+        """(legs + 1, 2) array of the (x, t) events where legs start and end."""
+        return np.column_stack((self.start_positions, self.start_times))
+
+    @property
+    def rapidities(self) -> NDArray[np.float64]:
+        return np.arctanh(self.velocities)
+
+    @property
+    def frame_changes(self) -> NDArray[np.float64]:
+        """Change of rapidity of the traveler at the start of each leg but the first."""
+        return np.diff(self.rapidities)
+
+    @property
+    def simultaneity_jumps(self) -> NDArray[np.float64]:
+        """
+        Jump of the Earth time simultaneous with the traveler, at the start of each leg
+        but the first. Positive when Earth suddenly ages in the traveler's frame.
+        """
+        return (self.velocities[:-1] - self.velocities[1:]) * self.start_positions[1:-1]
+
+    def legs(self, ages: ArrayLike) -> NDArray[np.intp]:
+        """
+        Index of the leg at each of the traveler's ages. At a change of legs, the later
+        leg is picked.
+        """
+        return np.clip(
+            np.searchsorted(self.start_ages, ages, side="right") - 1,
+            0,
+            len(self.durations) - 1,
+        )
+
+    def events(
+        self, ages: ArrayLike, legs: ArrayLike | None = None
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """
+        (x, t) in the Earth frame of the traveler at each age. legs is the leg of each
+        age, see legs(), and can be given to choose which leg ages at a change of legs
+        belong to.
+        """
+        ages = np.asarray(ages, dtype=np.float64)
+        if legs is None:
+            legs = self.legs(ages)
+        ages_in_leg: Final[NDArray[np.float64]] = ages - self.start_ages[legs]
+        gammas: Final[NDArray[np.float64]] = self.gammas[legs]
+        x: Final[NDArray[np.float64]] = self.start_positions[legs] + gammas * (
+            self.velocities[legs] * ages_in_leg
+        )
+        t: Final[NDArray[np.float64]] = self.start_times[legs] + gammas * ages_in_leg
+        return x, t
+
+    def earth_times(
+        self, ages: ArrayLike, legs: ArrayLike | None = None
+    ) -> NDArray[np.float64]:
+        """
+        Earth time simultaneous with each of the traveler's ages, in the traveler's
+        frame at that age, see events().
+        """
+        ages = np.asarray(ages, dtype=np.float64)
+        if legs is None:
+            legs = self.legs(ages)
+        return (
+            self.leg_start_earth_times[legs]
+            + (ages - self.start_ages[legs]) / self.gammas[legs]
+        )
+
+    def simultaneous_ages(self, earth_times: ArrayLike) -> NDArray[np.float64]:
+        """
+        Reverse of earth_times(): the traveler's age simultaneous with each Earth time,
+        in the traveler's frame at that age. Earth times skipped by a simultaneity jump
+        map to the age of the jump, and Earth times outside of the trip to NaN. Each
+        lookup is a binary search in the index of legs.
+        """
+        if np.any(self.simultaneity_jumps < 0):
+            raise ValueError(
+                "some Earth times are simultaneous with several ages of the traveler"
+            )
+        earth_times = np.asarray(earth_times, dtype=np.float64)
+        legs: Final[NDArray[np.intp]] = np.clip(
+            np.searchsorted(self.leg_start_earth_times, earth_times, side="right") - 1,
+            0,
+            len(self.durations) - 1,
+        )
+        ages: Final[NDArray[np.float64]] = self.start_ages[legs] + np.clip(
+            (earth_times - self.leg_start_earth_times[legs]) * self.gammas[legs],
+            0,
+            self.durations[legs],
+        )
+        return np.where(
+            (earth_times < self.leg_start_earth_times[0])
+            | (earth_times > self.leg_end_earth_times[-1]),
+            np.nan,
+            ages,
+        )
+
+
+class Trajectory:
+    """
+    World line of a traveler leaving Earth at rest at event (0, 0), with a proper
+    acceleration (ly/y², about 1.03 for 1 g, positive going away from Earth) that's
+    constant over each phase of the trip. Within a phase the motion is hyperbolic, so
+    events are computed exactly rather than integrated step by step. Phases are given by
+    their duration in the traveler's proper time.
+    """
+
+    def __init__(self, accelerations: ArrayLike, durations: ArrayLike) -> None:
+        self.accelerations: Final[NDArray[np.float64]] = frozen(
+            np.asarray(accelerations, dtype=np.float64)
+        )
+        self.durations: Final[NDArray[np.float64]] = frozen(
+            np.asarray(durations, dtype=np.float64)
+        )
+        if (
+            self.accelerations.shape != self.durations.shape
+            or self.accelerations.ndim != 1
+        ):
+            raise ValueError(
+                "accelerations and durations must be 1D and of same length"
+            )
+        if len(self.accelerations) == 0:
+            raise ValueError("trajectory must have at least one phase")
+        if not np.all(np.isfinite(self.accelerations)):
+            raise ValueError("accelerations must be finite")
+        if not np.all(np.isfinite(self.durations)):
+            raise ValueError("durations must be finite")
+        if np.any(self.durations < 0):
+            raise ValueError("durations must not be negative")
+
+        self.start_ages: Final[NDArray[np.float64]] = frozen(
+            _cumsum_from_zero(self.durations)
+        )
+        # Rapidity changes by acceleration * proper time.
+        self.start_rapidities: Final[NDArray[np.float64]] = frozen(
+            _cumsum_from_zero(self.accelerations * self.durations)
+        )
+        dx, dt = _hyperbolic_steps(
+            self.start_rapidities[:-1], self.accelerations, self.durations
+        )
+        self.start_positions: Final[NDArray[np.float64]] = frozen(_cumsum_from_zero(dx))
+        self.start_times: Final[NDArray[np.float64]] = frozen(_cumsum_from_zero(dt))
+
+    @classmethod
+    def from_acceleration(
+        cls,
+        acceleration: Callable[[NDArray[np.float64]], ArrayLike],
+        end_age: float,
+        phase_count: int = 1000,
+    ) -> "Trajectory":
+        """
+        Trajectory with the given proper acceleration as a function of the traveler's
+        ages (called once, with all the ages), held constant over each of phase_count
+        phases at its value in the middle of the phase.
+        """
+        duration: Final[float] = end_age / phase_count
+        middles: Final[NDArray[np.float64]] = (np.arange(phase_count) + 0.5) * duration
+        return cls(
+            np.broadcast_to(acceleration(middles), middles.shape),
+            np.full(phase_count, duration),
+        )
+
+    @classmethod
+    def round_trip(cls, distance: float, acceleration: float) -> "Trajectory":
+        """
+        Going to a planet at distance and back to Earth, accelerating and decelerating
+        at the given proper acceleration without ever coasting, and stopping on arrival.
+        """
+        if not 0 < acceleration < np.inf:
+            raise ValueError("acceleration must be positive and finite")
+        if not 0 < distance < np.inf:
+            raise ValueError("distance must be positive and finite")
+        # Half way to the planet, at x = (cosh(acceleration * age) - 1) / acceleration.
+        quarter: Final[float] = (
+            float(np.arccosh(1 + acceleration * distance / 2)) / acceleration
+        )
+        return cls(
+            [acceleration, -acceleration, -acceleration, acceleration],
+            [quarter] * 4,
+        )
+
+    @property
+    def end_age(self) -> float:
+        return float(self.start_ages[-1])
+
+    def phases(self, ages: ArrayLike) -> NDArray[np.intp]:
+        """Index of the phase at each of the traveler's ages."""
+        return np.clip(
+            np.searchsorted(self.start_ages, ages, side="right") - 1,
+            0,
+            len(self.durations) - 1,
+        )
+
+    def rapidities(self, ages: ArrayLike) -> NDArray[np.float64]:
+        ages = np.asarray(ages, dtype=np.float64)
+        phases: Final[NDArray[np.intp]] = self.phases(ages)
+        return self.start_rapidities[phases] + self.accelerations[phases] * (
+            ages - self.start_ages[phases]
+        )
+
+    def events(
+        self, ages: ArrayLike
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """(x, t) in the Earth frame of the traveler at each age."""
+        ages = np.asarray(ages, dtype=np.float64)
+        phases: Final[NDArray[np.intp]] = self.phases(ages)
+        dx, dt = _hyperbolic_steps(
+            self.start_rapidities[phases],
+            self.accelerations[phases],
+            ages - self.start_ages[phases],
+        )
+        return self.start_positions[phases] + dx, self.start_times[phases] + dt
+
+    def earth_times(self, ages: ArrayLike) -> NDArray[np.float64]:
+        """
+        Earth time simultaneous with each of the traveler's ages, in the traveler's
+        instantaneous rest frame.
+        """
+        x, t = self.events(ages)
+        return t - x * np.tanh(self.rapidities(ages))
+
+    def sample(self, rapidity_step: float = 0.05) -> NDArray[np.float64]:
+        """
+        Ages at which to sample the world line to draw it: an age each time its
+        direction turns by rapidity_step, plus the ends of the trip and of the phases
+        without acceleration, which are straight.
+        """
+        straight: Final[NDArray[np.bool_]] = self.accelerations == 0
+        ends: Final[NDArray[np.float64]] = self.start_ages[
+            np.concatenate(([True], straight)) | np.concatenate((straight, [True]))
+        ]
+        # Cumulated turning of the world line at the start of each phase.
+        turns: Final[NDArray[np.float64]] = _cumsum_from_zero(
+            np.abs(self.accelerations * self.durations)
+        )
+        targets: Final[NDArray[np.float64]] = np.arange(0.0, turns[-1], rapidity_step)
+        # Phases without acceleration don't turn, so no target falls in them.
+        phases: Final[NDArray[np.intp]] = np.clip(
+            np.searchsorted(turns, targets, side="right") - 1,
+            0,
+            len(self.durations) - 1,
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ages: Final[NDArray[np.float64]] = self.start_ages[phases] + (
+                targets - turns[phases]
+            ) / np.abs(self.accelerations[phases])
+        return np.union1d(ends, ages[np.isfinite(ages)])
+
+
+def _hyperbolic_steps(
+    start_rapidities: NDArray[np.float64],
+    accelerations: NDArray[np.float64],
+    ages: NDArray[np.float64],
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """
+    Moves in x and t after the given proper times at constant proper acceleration.
+    Written as sinh(h) / h rather than as differences of sinh and cosh, so that it stays
+    accurate for small (and zero) accelerations.
+    """
+    half_turns: Final[NDArray[np.float64]] = accelerations * ages / 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sinhc: Final[NDArray[np.float64]] = np.where(
+            half_turns == 0, 1.0, np.sinh(half_turns) / half_turns
+        )
+    middle_rapidities: Final[NDArray[np.float64]] = start_rapidities + half_turns
+    return (
+        ages * np.sinh(middle_rapidities) * sinhc,
+        ages * np.cosh(middle_rapidities) * sinhc,
+    )
+
+
+def _cumsum_from_zero(values: NDArray[np.float64]) -> NDArray[np.float64]:
+    sums: Final[NDArray[np.float64]] = np.empty(len(values) + 1, dtype=np.float64)
+    sums[0] = 0.0
+    np.cumsum(values, out=sums[1:])
+    return sums